@@ -0,0 +1,344 @@
+# Micro-benchmarks do jogo final. Rode a partir desta pasta:
+#   python bench.py flip
+#   python bench.py collisions
+#   python bench.py horde
+#   python bench.py waves --targets 100 1000 10000 --json waves.json
+#   python bench.py blit
+#   python bench.py walls
+import argparse
+import json
+import random
+import sys
+import time
+
+import pygame as pg
+
+import config as C
+from controls import FIRE, InputState
+from headless import SimClock, init_headless, make_world
+from profiler import FrameProfiler, NullProfiler, percentile
+
+
+class FlipCounter:
+    def __init__(self):
+        self.calls = 0
+        self.original = pg.transform.flip
+
+    def __enter__(self):
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return self.original(*args, **kwargs)
+
+        pg.transform.flip = counted
+        return self
+
+    def __exit__(self, *exc):
+        pg.transform.flip = self.original
+
+
+def legacy_update_image(enemy, frame_list):
+    # caminho antigo: um flip (e uma Surface nova) a cada troca de frame
+    base_img = frame_list[enemy.frame_index % len(frame_list)]
+    if enemy.facing == "LEFT":
+        base_img = pg.transform.flip(base_img, True, False)
+    enemy.image = base_img
+    enemy.rect = enemy.image.get_rect(center=enemy.pos)
+
+
+def bench_flip(args):
+    init_headless()
+    from sprites import Enemy
+
+    enemies = [Enemy((100, 100), None) for _ in range(args.enemies)]
+    for e in enemies:
+        e.facing = "LEFT"
+
+    results = {}
+    for mode in ("legacy", "bank"):
+        with FlipCounter() as counter:
+            t0 = time.perf_counter()
+            for frame in range(args.frames):
+                for e in enemies:
+                    e.frame_index = frame
+                    if mode == "legacy":
+                        legacy_update_image(e, e.frames_walk["RIGHT"])
+                    else:
+                        e.update_image(e.frames_walk)
+            elapsed = time.perf_counter() - t0
+        results[mode] = (elapsed, counter.calls)
+
+    print(f"{args.enemies} inimigos x {args.frames} trocas de frame")
+    for mode, (elapsed, calls) in results.items():
+        per_frame = elapsed / args.frames * 1000.0
+        print(f"  {mode:<7} {per_frame:8.4f} ms/frame  {calls:8d} surfaces alocadas")
+
+
+def legacy_collisions(world):
+    # broad phase antiga: groupcollide + lista de vivos + spritecollide
+    pg.sprite.groupcollide(world.sword_attacks, world.enemies, False, False)
+    live_enemies = [e for e in world.enemies if e.state != "DEATH"]
+    pg.sprite.spritecollide(world.player, live_enemies, False, pg.sprite.collide_rect)
+
+
+def bench_collisions(args):
+    init_headless()
+    from sprites import Enemy
+    from systems import World
+
+    world = make_world(SimClock())
+    world.try_fire()
+    random.seed(1)
+    center = world.player.rect.inflate(200, 200)
+
+    print(f"{'inimigos':>9} {'antigo ms':>10} {'hash ms':>10}")
+    for count in args.counts:
+        for enemy in list(world.enemies):
+            enemy.kill()
+        while len(world.enemies) < count:
+            pos = (random.uniform(0, C.WIDTH), random.uniform(0, C.HEIGHT))
+            enemy = Enemy(pos, None)
+            # longe do player e da espada: mede só a broad phase
+            if not center.colliderect(enemy.rect):
+                enemy.join_hash(world.enemy_hash)
+                world.enemies.add(enemy)
+
+        timings = []
+        for func in (legacy_collisions, World.handle_collisions):
+            t0 = time.perf_counter()
+            for _ in range(args.frames):
+                func(world)
+            timings.append((time.perf_counter() - t0) / args.frames * 1000.0)
+        print(f"{count:>9} {timings[0]:>10.3f} {timings[1]:>10.3f}")
+
+
+def bench_horde(args):
+    init_headless()
+
+    print(f"{'inimigos':>9} {'por sprite ms':>14} {'arrays ms':>10}")
+    for count in args.counts:
+        timings = []
+        for soa in (False, True):
+            C.ENEMY_SOA = soa
+            random.seed(1)
+            world = make_world(SimClock())
+            world.max_enemies = count
+            while len(world.enemies) < count:
+                world.spawn_enemy()
+
+            t0 = time.perf_counter()
+            for _ in range(args.frames):
+                world.player.invuln = 1.0
+                world.enemy_timer = 1.0
+                world.update(1.0 / C.FPS)
+            timings.append((time.perf_counter() - t0) / args.frames * 1000.0)
+        print(f"{count:>9} {timings[0]:>14.3f} {timings[1]:>10.3f}")
+
+
+def ramp_waves(world, target, burst):
+    # acelera a lógica real de ondas: cada passo fecha uma onda até o limite
+    # cobrir o alvo, e os spawns saem em rajadas em vez de um por spawn_rate
+    if world.max_enemies < target:
+        world.wave_timer = C.WAVE_DURATION
+    missing = min(world.max_enemies, target) - len(world.enemies)
+    for _ in range(min(burst, missing)):
+        world.spawn_enemy()
+    world.enemy_timer = world.spawn_rate
+
+
+def phase_stats(values):
+    ordered = sorted(values)
+    return {f"p{pct}": round(percentile(ordered, pct), 4) for pct in (50, 95, 99)}
+
+
+def bench_waves(args):
+    screen = init_headless()
+    font = pg.font.Font(None, 20)
+    clock = SimClock(C.SIM_HZ)
+    random.seed(args.seed)
+    world = make_world(clock)
+    dt = 1.0 / C.SIM_HZ
+    fire = InputState(0, FIRE)
+    idle = InputState()
+    step = 0
+
+    def advance(draw):
+        nonlocal step
+        world.player.invuln = 1.0
+        world.update(dt, fire if step % args.fire_every == 0 else idle)
+        if draw:
+            world.draw(screen, font)
+        clock.tick()
+        step += 1
+
+    samples = []
+    print(f"{'inimigos':>9} {'onda':>5} {'update p50/p95':>15} {'colisão p50/p95':>16} "
+          f"{'draw p50/p95':>13} {'frame p95':>10}")
+    for target in args.targets:
+        t0 = time.perf_counter()
+        world.prof = NullProfiler()
+        # a rampa não desenha: só os frames medidos pagam o draw
+        while len(world.enemies) < target:
+            ramp_waves(world, target, args.burst)
+            advance(False)
+        ramp_s = time.perf_counter() - t0
+
+        prof = world.prof = FrameProfiler(window=args.frames)
+        for _ in range(args.frames):
+            ramp_waves(world, target, args.burst)
+            prof.begin_frame()
+            advance(not args.no_draw)
+            prof.end_frame()
+
+        draw = [b + s + h for b, s, h in zip(
+            prof.samples["background"], prof.samples["sprites"], prof.samples["hud"]
+        )]
+        sample = {
+            "target": target,
+            "enemies": len(world.enemies),
+            "wave": world.wave,
+            "steps": step,
+            "ramp_s": round(ramp_s, 3),
+            "update_ms": phase_stats(prof.samples["update"]),
+            "collisions_ms": phase_stats(prof.samples["collisions"]),
+            "draw_ms": phase_stats(draw),
+            "frame_ms": phase_stats(prof.totals),
+        }
+        samples.append(sample)
+        print(
+            f"{sample['enemies']:>9} {sample['wave']:>5} "
+            f"{sample['update_ms']['p50']:>7.2f}/{sample['update_ms']['p95']:<7.2f} "
+            f"{sample['collisions_ms']['p50']:>8.2f}/{sample['collisions_ms']['p95']:<7.2f} "
+            f"{sample['draw_ms']['p50']:>6.2f}/{sample['draw_ms']['p95']:<6.2f} "
+            f"{sample['frame_ms']['p95']:>10.2f}"
+        )
+
+    report = {
+        "bench": "waves",
+        "seed": args.seed,
+        "frames": args.frames,
+        "sim_hz": C.SIM_HZ,
+        "draw": not args.no_draw,
+        "enemy_soa": world.horde is not None,
+        "samples": samples,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[PERF] relatório salvo em {args.json}")
+
+
+def time_blits(screen, surf, count):
+    # posições espalhadas para não medir só o caso de cache quente
+    w, h = screen.get_size()
+    t0 = time.perf_counter()
+    for i in range(count):
+        screen.blit(surf, ((i * 97) % w, (i * 61) % h))
+    return (time.perf_counter() - t0) / count * 1e6
+
+
+def bench_blit(args):
+    screen = init_headless()
+    from PIL import Image
+
+    from sprites import ENEMY_SIZE, SKELETON_FOLDER, SKELETON_NAMES
+    from systems import MAP_PATHS
+    from utils import decode_gif_frame, display_format, frame_paths, read_image
+
+    pil_img = Image.open(MAP_PATHS[0])
+    raw_bg = decode_gif_frame(pil_img, (C.WIDTH, C.HEIGHT))
+    backgrounds = [
+        ("frombytes RGBA", raw_bg),
+        ("convert_alpha", raw_bg.convert_alpha()),
+        ("convert", display_format(raw_bg, alpha=False)),
+    ]
+
+    raw_sprite = pg.transform.scale(
+        read_image(frame_paths(SKELETON_FOLDER, SKELETON_NAMES)[0]), ENEMY_SIZE
+    )
+    alpha_sprite = pg.transform.scale(raw_sprite.convert_alpha(), ENEMY_SIZE)
+    rle_sprite = alpha_sprite.copy()
+    rle_sprite.set_alpha(255, pg.RLEACCEL)
+    sprites = [
+        ("png sem convert", raw_sprite),
+        ("convert_alpha", alpha_sprite),
+        ("convert_alpha+RLE", rle_sprite),
+    ]
+
+    print(f"fundo {C.WIDTH}x{C.HEIGHT}, {args.frames} blits")
+    for name, surf in backgrounds:
+        us = time_blits(screen, surf, args.frames)
+        print(f"  {name:<18} {us / 1000.0:8.3f} ms/blit")
+    print(f"sprite {ENEMY_SIZE[0]}x{ENEMY_SIZE[1]}, {args.sprites} blits")
+    for name, surf in sprites:
+        us = time_blits(screen, surf, args.sprites)
+        print(f"  {name:<18} {us:8.3f} us/blit  "
+              f"({us * args.per_frame / 1000.0:6.2f} ms para {args.per_frame} por frame)")
+
+
+def bench_walls(args):
+    # confere o coalesce_rects nos mapas de verdade: nunca mais retângulos
+    # que a entrada e exatamente a mesma área coberta
+    from spatial import coalesce_rects, union_area
+    from systems import WALL_PATHS
+
+    failed = 0
+    print(f"{'mapa':<10} {'paredes':>8} {'juntadas':>9} {'área':>8} {'sobreposta':>11} {'ms':>7}")
+    for path in WALL_PATHS:
+        with open(path, encoding="utf-8") as f:
+            raw = [pg.Rect(r) for r in json.load(f)["walls"]]
+        t0 = time.perf_counter()
+        merged = coalesce_rects(raw)
+        ms = (time.perf_counter() - t0) * 1000.0
+        area = union_area(merged)
+        overlap = sum(r.width * r.height for r in merged) - area
+        print(f"{path.stem:<10} {len(raw):>8} {len(merged):>9} {area:>8} {overlap:>11} {ms:>7.2f}")
+        if len(merged) > len(raw) or area != union_area(raw):
+            print(f"[ERRO] {path.stem}: coalesce_rects mudou a área ou aumentou o conjunto")
+            failed += 1
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("flip", help="flip por frame vs bancos espelhados")
+    p.add_argument("--enemies", type=int, default=50)
+    p.add_argument("--frames", type=int, default=600)
+    p.set_defaults(func=bench_flip)
+
+    p = sub.add_parser("collisions", help="broad phase antiga vs hash espacial")
+    p.add_argument("--counts", type=int, nargs="+", default=[10, 100, 500, 1000, 2000])
+    p.add_argument("--frames", type=int, default=200)
+    p.set_defaults(func=bench_collisions)
+
+    p = sub.add_parser("horde", help="World.update com inimigos por sprite vs arrays")
+    p.add_argument("--counts", type=int, nargs="+", default=[50, 500, 5000])
+    p.add_argument("--frames", type=int, default=100)
+    p.set_defaults(func=bench_horde)
+
+    p = sub.add_parser("waves", help="ondas aceleradas até N inimigos, tempo por fase")
+    p.add_argument("--targets", type=int, nargs="+", default=[100, 1000, 10000])
+    p.add_argument("--frames", type=int, default=120, help="frames medidos em cada alvo")
+    p.add_argument("--burst", type=int, default=100, help="spawns por passo durante a rampa")
+    p.add_argument("--fire-every", type=int, default=30)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--no-draw", action="store_true")
+    p.add_argument("--json", metavar="ARQUIVO", help="grava o relatório em JSON")
+    p.set_defaults(func=bench_waves)
+
+    p = sub.add_parser("blit", help="blit em formato cru vs formato da tela e RLE")
+    p.add_argument("--frames", type=int, default=200, help="blits de fundo")
+    p.add_argument("--sprites", type=int, default=20000, help="blits de sprite")
+    p.add_argument("--per-frame", type=int, default=500, help="sprites por frame na estimativa")
+    p.set_defaults(func=bench_blit)
+
+    p = sub.add_parser("walls", help="paredes juntadas: contagem e área por mapa")
+    p.set_defaults(func=bench_walls)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -46,4 +46,37 @@ MIN_SPAWN_RATE = 0.5
 
 MASTER_VOLUME = 0.5
 MUSIC_VOLUME_RATIO = 0.8
-SFX_VOLUME_RATIO = 0.5
\ No newline at end of file
+SFX_VOLUME_RATIO = 0.5
+
+FRAME_CACHE_MAX_BYTES = 32 * 1024 * 1024
+BACKGROUND_LAZY = False
+BACKGROUND_RING_SIZE = 3
+
+PRELOAD_WORKERS = 4
+
+WALL_GRID_CELL = 64
+ENEMY_HASH_CELL = 64
+
+ENEMY_SOA = True
+
+SIM_HZ = 120
+MAX_SIM_STEPS = 5
+
+PROFILE_WINDOW = 300          # frames usados nos percentis
+PROFILE_STATS_EVERY = 30      # recalcula os percentis a cada N frames
+PROFILE_GRAPH_SIZE = (300, 80)
+PROFILE_GRAPH_MS = 33.3       # topo do gráfico
+PROFILE_LOG = None            # ex.: "perf.csv" ou "perf.json"
+
+JOY_DEADZONE = 0.25
+
+REPLAY_RECORD = None          # ex.: "partida.iwr" grava seed, dt e entradas
+REPLAY_CHECK_EVERY = 120      # passos entre checksums do estado
+
+ENEMY_POOL_PREFILL = 0        # veja o pico em headless.py para dimensionar
+SWORD_POOL_PREFILL = 2
+
+SPRITE_RLE = True             # RLE nos frames estáticos com transparência
+
+ENEMY_FLOW = True             # inimigos contornam paredes pelo campo de direções
+FLOW_CELL = 32
\ No newline at end of file
@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+
+import pygame as pg
+
+import config as C
+
+LEFT = 1 << 0
+RIGHT = 1 << 1
+UP = 1 << 2
+DOWN = 1 << 3
+FIRE = 1 << 4
+HYPER = 1 << 5
+WALLS = 1 << 6
+
+KEY_BINDINGS = {
+    LEFT: (pg.K_LEFT, pg.K_a),
+    RIGHT: (pg.K_RIGHT, pg.K_d),
+    UP: (pg.K_UP, pg.K_w),
+    DOWN: (pg.K_DOWN, pg.K_s),
+    FIRE: (pg.K_SPACE,),
+    HYPER: (pg.K_LSHIFT,),
+    WALLS: (pg.K_h,),
+}
+JOY_BUTTONS = {0: FIRE, 1: HYPER}
+
+KEY_TO_BIT = {key: bit for bit, keys in KEY_BINDINGS.items() for key in keys}
+
+
+@dataclass(frozen=True)
+class InputState:
+    # Foto da entrada de um frame: bits seguros, apertados e soltos agora.
+    held: int = 0
+    pressed: int = 0
+    released: int = 0
+
+    def down(self, bit):
+        return bool(self.held & bit)
+
+    def hit(self, bit):
+        return bool(self.pressed & bit)
+
+    def settled(self):
+        # mesmo estado sem as bordas, para os passos extras do mesmo frame
+        if not (self.pressed or self.released):
+            return self
+        return InputState(self.held)
+
+
+NO_INPUT = InputState()
+
+
+class InputSampler:
+    # Lê teclado e joystick uma vez por frame. Os eventos KEYDOWN/JOYBUTTONDOWN
+    # só marcam bordas, para um toque mais curto que um frame não se perder.
+    def __init__(self, joy=None):
+        self.joy = joy
+        self.prev_held = 0
+        self.latched = 0
+
+    def handle_event(self, e):
+        if e.type == pg.KEYDOWN:
+            self.latched |= KEY_TO_BIT.get(e.key, 0)
+        elif e.type == pg.JOYBUTTONDOWN and self.joy is not None:
+            self.latched |= JOY_BUTTONS.get(e.button, 0)
+
+    def carry(self, state):
+        # nenhum passo de simulação rodou: as bordas ficam para o próximo frame
+        self.latched |= state.pressed
+
+    def reset(self):
+        # troca de cena: a tecla que começou a partida (e qualquer outra já
+        # segurada) não vira borda no primeiro passo
+        self.latched = 0
+        self.prev_held = self._held()
+
+    def sample(self):
+        held = self._held()
+        pressed = (held & ~self.prev_held) | self.latched
+        released = self.prev_held & ~held
+        self.prev_held = held
+        self.latched = 0
+        return InputState(held, pressed, released)
+
+    def _held(self):
+        keys = pg.key.get_pressed()
+        held = 0
+        for bit, bound in KEY_BINDINGS.items():
+            for key in bound:
+                if keys[key]:
+                    held |= bit
+                    break
+        if self.joy is not None:
+            held |= self._joy_bits()
+        return held
+
+    def _joy_bits(self):
+        bits = 0
+        ax = self.joy.get_axis(0)
+        ay = self.joy.get_axis(1)
+        dz = C.JOY_DEADZONE
+        if ax * ax + ay * ay > dz * dz:
+            if ax < -dz:
+                bits |= LEFT
+            elif ax > dz:
+                bits |= RIGHT
+            if ay < -dz:
+                bits |= UP
+            elif ay > dz:
+                bits |= DOWN
+        for button, bit in JOY_BUTTONS.items():
+            if button < self.joy.get_numbuttons() and self.joy.get_button(button):
+                bits |= bit
+        return bits
@@ -0,0 +1,161 @@
+import heapq
+import math
+
+import pygame as pg
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from spatial import union_area
+
+# custo octil inteiro: reto 2, diagonal 3
+STRAIGHT = 2
+DIAGONAL = 3
+UNREACHED = 1 << 30
+
+DIAG = 1 / math.sqrt(2)
+
+
+class FlowGrid:
+    # Parte estática do campo: grade grossa do mapa, células bloqueadas e a
+    # lista de vizinhos de cada célula. A tela é um toro (inimigos dão a volta),
+    # então os vizinhos também dão. Montada uma vez por mapa.
+    def __init__(self, wall_map, cell_size, screen_size):
+        self.cell_size = cell_size
+        self.cols = -(-screen_size[0] // cell_size)
+        self.rows = -(-screen_size[1] // cell_size)
+        count = self.cols * self.rows
+
+        # bloqueada se as paredes cobrem metade da célula ou mais; os retângulos
+        # do WallMap podem se sobrepor, então conta a área da união
+        self.blocked = bytearray(count)
+        half = cell_size * cell_size / 2
+        for i in range(count):
+            cell = pg.Rect((i % self.cols) * cell_size, (i // self.cols) * cell_size,
+                           cell_size, cell_size)
+            covered = union_area([cell.clip(r) for r in wall_map.query(cell)])
+            if covered >= half:
+                self.blocked[i] = 1
+
+        self.neighbors = [self._neighbors(i) for i in range(count)]
+
+    def __len__(self):
+        return self.cols * self.rows
+
+    def index(self, x, y):
+        return (int(y) // self.cell_size % self.rows) * self.cols + int(x) // self.cell_size % self.cols
+
+    def _neighbors(self, i):
+        # (vizinho, custo, dx, dy); diagonal só se as duas retas estiverem livres
+        if self.blocked[i]:
+            return []
+        cols, rows = self.cols, self.rows
+        cx, cy = i % cols, i // cols
+        result = []
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                j = ((cy + dy) % rows) * cols + (cx + dx) % cols
+                if self.blocked[j]:
+                    continue
+                if dx and dy:
+                    side_a = cy * cols + (cx + dx) % cols
+                    side_b = ((cy + dy) % rows) * cols + cx
+                    if self.blocked[side_a] or self.blocked[side_b]:
+                        continue
+                    result.append((j, DIAGONAL, dx, dy))
+                else:
+                    result.append((j, STRAIGHT, dx, dy))
+        return result
+
+
+class FlowField:
+    # Direção para o player em cada célula da FlowGrid. O Dijkstra só roda
+    # quando o player troca de célula; cada inimigo faz uma consulta O(1).
+    # Perto do player (ou sem caminho) a célula é inválida e o inimigo
+    # volta a mirar direto nele.
+    def __init__(self, grid):
+        self.grid = grid
+        count = len(grid)
+        self.dist = [UNREACHED] * count
+        self.dir_x = [0.0] * count
+        self.dir_y = [0.0] * count
+        self.valid = bytearray(count)
+        self.target = None
+        self.builds = 0
+        self.dirs = None
+        self.valid_mask = None
+
+    def update(self, pos):
+        grid = self.grid
+        x = min(max(pos[0], 0), grid.cols * grid.cell_size - 1)
+        y = min(max(pos[1], 0), grid.rows * grid.cell_size - 1)
+        target = grid.index(x, y)
+        if target == self.target:
+            return False
+        self.target = target
+        self._solve(target)
+        self.builds += 1
+        return True
+
+    def direction(self, x, y):
+        i = self.grid.index(x, y)
+        if not self.valid[i]:
+            return None
+        return self.dir_x[i], self.dir_y[i]
+
+    def cells(self, pos):
+        # versão em lote de grid.index para os arrays do EnemyStore
+        # int() trunca como em grid.index; as posições do EnemyStore são >= 0
+        grid = self.grid
+        cell = pos.astype(np.int64) // grid.cell_size
+        return (cell[:, 1] % grid.rows) * grid.cols + cell[:, 0] % grid.cols
+
+    def _solve(self, target):
+        grid = self.grid
+        dist = self.dist
+        for i in range(len(dist)):
+            dist[i] = UNREACHED
+        neighbors = grid.neighbors
+
+        dist[target] = 0
+        heap = [(0, target)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            for j, cost, _, _ in neighbors[i]:
+                nd = d + cost
+                if nd < dist[j]:
+                    dist[j] = nd
+                    heapq.heappush(heap, (nd, j))
+
+        valid = self.valid
+        dir_x, dir_y = self.dir_x, self.dir_y
+        for i in range(len(dist)):
+            valid[i] = 0
+            # alvo e vizinhos imediatos: mira direta é melhor que a grade
+            if dist[i] <= DIAGONAL or dist[i] == UNREACHED:
+                continue
+            best = dist[i]
+            step = None
+            for j, _, dx, dy in neighbors[i]:
+                if dist[j] < best:
+                    best = dist[j]
+                    step = (dx, dy)
+            if step is None:
+                continue
+            if step[0] and step[1]:
+                dir_x[i] = step[0] * DIAG
+                dir_y[i] = step[1] * DIAG
+            else:
+                dir_x[i] = float(step[0])
+                dir_y[i] = float(step[1])
+            valid[i] = 1
+
+        if np is not None:
+            self.dirs = np.column_stack((dir_x, dir_y))
+            self.valid_mask = np.frombuffer(bytes(valid), dtype=np.uint8).astype(bool)
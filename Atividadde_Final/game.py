@@ -1,12 +1,16 @@
 import random
 import sys
 from dataclasses import dataclass
-import math
+import time
 import pygame as pg
 
 import config as C
 from systems import World
 from utils import text, AnimatedBackground
+from preload import preload_game_assets, GAMEOVER_PATH
+from profiler import FrameProfiler
+from controls import InputSampler
+from replay import ReplayRecorder
 
 
 @dataclass
@@ -16,6 +20,9 @@ class Scene:
 
 class Game:
     def __init__(self):
+        self.t_boot = time.perf_counter()
+        self.t_play = None
+        self.first_frame_reported = False
         pg.init()
         pg.joystick.init()
         self.joy = None
@@ -23,6 +30,7 @@ class Game:
             self.joy = pg.joystick.Joystick(0)
             self.joy.init()
             print("Joystick conectado:", self.joy.get_name())
+        self.input = InputSampler(self.joy)
 
         if C.RANDOM_SEED is not None:
             random.seed(C.RANDOM_SEED)
@@ -33,68 +41,88 @@ class Game:
         self.font = pg.font.SysFont("consolas", 20)
         self.big = pg.font.SysFont("consolas", 48)
         self.scene = Scene("menu")
-        self.world = World()
-
-        self.go_bg = AnimatedBackground("assets/gameover.gif", (C.WIDTH, C.HEIGHT))
+        self.sim_dt = 1.0 / C.SIM_HZ
+        self.accumulator = 0.0
+        self.world = None
+        self.go_bg = None
+        self.prof = FrameProfiler(log_path=C.PROFILE_LOG)
+        self.recorder = ReplayRecorder(C.REPLAY_RECORD) if C.REPLAY_RECORD else None
 
         try:
             menu_img = pg.image.load("assets/menu.png").convert()
             self.menu_bg = pg.transform.scale(menu_img, (C.WIDTH, C.HEIGHT))
         except Exception as e:
             print(f"[ERRO] Não carregou menu.png: {e}")
-            self.menu_bg = pg.Surface((C.WIDTH, C.HEIGHT))
+            self.menu_bg = pg.Surface((C.WIDTH, C.HEIGHT)).convert()
             self.menu_bg.fill((0, 0, 0))
 
+        self.preloader = preload_game_assets()
+
+    def start_play(self):
+        # o que ainda estiver na fila termina aqui, sem recarregar nada
+        self.preloader.wait()
+        if self.world is None:
+            self.world = self.new_world()
+            self.go_bg = AnimatedBackground(GAMEOVER_PATH, (C.WIDTH, C.HEIGHT))
+        self.scene = Scene("play")
+        self.input.reset()
+        if self.t_play is None:
+            self.t_play = time.perf_counter()
+
+    def next_seed(self):
+        seed = C.RANDOM_SEED if C.RANDOM_SEED is not None else random.getrandbits(32)
+        if self.recorder is not None:
+            self.recorder.new_world(seed)
+        return seed
+
+    def new_world(self):
+        return World(prof=self.prof, seed=self.next_seed())
+
+    def report_first_frame(self):
+        now = time.perf_counter()
+        print(
+            f"[PERF] Primeiro frame jogável: {(now - self.t_boot) * 1000:.0f} ms "
+            f"após iniciar ({(now - self.t_play) * 1000:.0f} ms desde sair do menu)"
+        )
+        self.first_frame_reported = True
+
     def run(self):
         while True:
             dt = self.clock.tick(C.FPS) / 1000.0
+            self.prof.begin_frame()
 
             for e in pg.event.get():
                 if e.type == pg.QUIT:
-                    pg.quit()
-                    sys.exit(0)
+                    self.quit()
                 if e.type == pg.KEYDOWN and e.key == pg.K_ESCAPE:
-                    pg.quit()
-                    sys.exit(0)
+                    self.quit()
+                if e.type == pg.KEYDOWN and e.key == pg.K_F3:
+                    self.prof.toggle()
                 if e.type == pg.MOUSEBUTTONDOWN:
                     mx, my = pg.mouse.get_pos()
-                    print(f"self.walls.add(Wall({mx}, {my}, 50, 50))")
+                    print(f"[{mx}, {my}, 50, 50],")
 
                 if self.scene.name == "play":
-                    if e.type == pg.KEYDOWN and e.key == pg.K_SPACE:
-                        self.world.try_fire()
-                    if e.type == pg.KEYDOWN and e.key == pg.K_LSHIFT:
-                        self.world.player.hyperspace()
-
-                    if e.type == pg.JOYBUTTONDOWN and self.joy is not None:
-                        if e.button == 0:
-                            self.world.try_fire()
-                        if e.button == 1:
-                            self.world.player.hyperspace()
+                    self.input.handle_event(e)
 
                 elif self.scene.name == "menu":
                     if e.type == pg.KEYDOWN or e.type == pg.JOYBUTTONDOWN:
-                        self.scene = Scene("play")
+                        self.start_play()
 
                 elif self.scene.name == "gameover":
                     if e.type == pg.KEYDOWN or e.type == pg.JOYBUTTONDOWN:
-                        self.world = World()
+                        self.world.reset(self.next_seed())
                         self.scene = Scene("play")
+                        self.input.reset()
 
-            keys = pg.key.get_pressed()
-            joy_input = {"thrust": False, "aim_x": 0.0, "aim_y": 0.0}
-            if self.joy is not None and self.scene.name == "play":
-                x_axis = self.joy.get_axis(0)
-                y_axis = self.joy.get_axis(1)
-                deadzone = 0.25
-                magnitude = math.hypot(x_axis, y_axis)
-                if magnitude > deadzone:
-                    joy_input["aim_x"] = x_axis
-                    joy_input["aim_y"] = y_axis
-                    joy_input["thrust"] = True
+            inp = self.input.sample()
+            self.prof.lap("events")
 
             self.screen.fill(C.BLACK)
 
+            # fora do menu o poll só entrega frames dos fundos em streaming
+            self.preloader.poll()
+
             if self.scene.name == "menu":
                 self.draw_menu()
 
@@ -102,8 +130,8 @@ class Game:
                 if self.world.is_game_over:
                     self.scene = Scene("gameover")
                 else:
-                    self.world.update(dt, keys, joy_input)
-                    self.world.draw(self.screen, self.font)
+                    alpha = self.step_world(dt, inp)
+                    self.world.draw(self.screen, self.font, alpha)
 
             elif self.scene.name == "gameover":
                 self.go_bg.update(dt)
@@ -124,8 +152,62 @@ class Game:
                         C.WIDTH // 2 - 130,
                         C.HEIGHT // 2 + 20,
                     )
+            self.prof.lap("background")
 
+            self.prof.draw(self.screen, self.font)
+            self.prof.lap("hud")
             pg.display.flip()
+            self.prof.lap("flip")
+            self.prof.end_frame()
+
+            if self.scene.name == "play" and not self.first_frame_reported:
+                self.report_first_frame()
+
+    def quit(self):
+        self.prof.close()
+        self.preloader.shutdown()
+        if self.world is not None:
+            stats = self.world.sound.stats()
+            if stats:
+                t = stats["total"]
+                print(
+                    f"[PERF] Sons: {t['played']} tocados, {t['coalesced']} juntados, "
+                    f"{t['dropped']} descartados, {t['stolen']} roubados"
+                )
+        if self.recorder is not None:
+            self.recorder.close()
+        pg.quit()
+        sys.exit(0)
+
+    def step_world(self, dt, inp):
+        # passo fixo de simulação; o render interpola o que sobrar
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= self.sim_dt and steps < C.MAX_SIM_STEPS:
+            self.world.update(self.sim_dt, inp)
+            if self.recorder is not None:
+                self.recorder.step(self.sim_dt, inp, self.world)
+            # as bordas (tiro, H) valem só para o primeiro passo do frame
+            inp = inp.settled()
+            self.accumulator -= self.sim_dt
+            steps += 1
+            if self.world.is_game_over:
+                break
+        if steps == 0:
+            self.input.carry(inp)
+        if steps == C.MAX_SIM_STEPS:
+            # atrasou demais: descarta o resto em vez de acelerar o jogo
+            self.accumulator = min(self.accumulator, self.sim_dt)
+        return self.accumulator / self.sim_dt
 
     def draw_menu(self):
-        self.screen.blit(self.menu_bg, (0, 0))
\ No newline at end of file
+        self.screen.blit(self.menu_bg, (0, 0))
+
+        if not self.preloader.finished:
+            pct = int(self.preloader.progress * 100)
+            bar = pg.Rect(C.WIDTH // 2 - 150, C.HEIGHT - 60, 300, 12)
+            pg.draw.rect(self.screen, C.GRAY, bar, width=1)
+            fill = bar.inflate(-4, -4)
+            fill.width = int(fill.width * self.preloader.progress)
+            pg.draw.rect(self.screen, C.WHITE, fill)
+            text(self.screen, self.font, f"Carregando... {pct}%", bar.x, bar.y - 28)
\ No newline at end of file
@@ -0,0 +1,120 @@
+# Roda a simulação do World sem tela e sem som, o mais rápido possível:
+#   python headless.py --frames 10000 --draw
+#   python headless.py --frames 3600 --draw --profile perf.csv
+import argparse
+import os
+import random
+import sys
+import time
+
+import pygame as pg
+
+import config as C
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def init_headless():
+    # precisa vir antes do pg.init(); convert_alpha ainda exige um set_mode
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.chdir(BASE_DIR)
+    pg.init()
+    return pg.display.set_mode((C.WIDTH, C.HEIGHT))
+
+
+class SimClock:
+    # Relógio injetado: cada tick avança um passo fixo de tempo simulado.
+    def __init__(self, fps=C.FPS):
+        self.step_ms = 1000.0 / fps
+        self.elapsed_ms = 0.0
+
+    def tick(self):
+        self.elapsed_ms += self.step_ms
+        return self.step_ms
+
+    def get_ticks(self):
+        return int(self.elapsed_ms)
+
+
+def make_world(clock, prof=None, seed=None):
+    from sound import NullSound
+    from systems import World
+
+    if seed is None:
+        # deriva do random global, que run(seed=...) já semeou
+        seed = random.getrandbits(32)
+    return World(sound=NullSound(), ticks=clock.get_ticks, prof=prof, seed=seed)
+
+
+def run(frames, fps=C.FPS, draw=False, seed=None, world=None, prof=None):
+    screen = pg.display.get_surface()
+    font = pg.font.Font(None, 20) if draw else None
+    clock = SimClock(fps)
+    if seed is not None:
+        random.seed(seed)
+    if world is None:
+        world = make_world(clock, prof)
+
+    restarts = 0
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        dt = clock.tick() / 1000.0
+        if prof is not None:
+            prof.begin_frame()
+        world.update(dt)
+        if draw:
+            world.draw(screen, font)
+        if prof is not None:
+            prof.end_frame()
+        if world.is_game_over:
+            world.reset(random.getrandbits(32))
+            restarts += 1
+    wall = time.perf_counter() - t0
+
+    return {
+        "frames": frames,
+        "wall_s": wall,
+        "sim_fps": frames / wall if wall > 0 else float("inf"),
+        "sim_s": clock.elapsed_ms / 1000.0,
+        "restarts": restarts,
+        "score": world.score,
+        "wave": world.wave,
+        "enemies": len(world.enemies),
+        "enemy_pool": world.enemy_pool.stats(),
+        "sword_pool": world.sword_pool.stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--fps", type=int, default=C.FPS)
+    parser.add_argument("--draw", action="store_true", help="desenha numa surface offscreen")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--profile", metavar="ARQUIVO", help="grava o tempo das fases (.csv ou .json)")
+    args = parser.parse_args(argv)
+
+    init_headless()
+    prof = None
+    if args.profile:
+        from profiler import FrameProfiler
+        prof = FrameProfiler(log_path=args.profile)
+    r = run(args.frames, args.fps, args.draw, args.seed, prof=prof)
+    if prof is not None:
+        prof.close()
+    print(
+        f"{r['frames']} frames em {r['wall_s']:.2f} s -> {r['sim_fps']:.0f} FPS simulados "
+        f"({r['sim_s'] / r['wall_s']:.1f}x tempo real)"
+    )
+    print(f"onda {r['wave']}, pontos {r['score']}, inimigos {r['enemies']}, reinícios {r['restarts']}")
+    for name in ("enemy_pool", "sword_pool"):
+        p = r[name]
+        print(
+            f"{name}: pico {p['high_water']}, criados {p['created']}, "
+            f"reuso {p['reuse_rate'] * 100:.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
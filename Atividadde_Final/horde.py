@@ -0,0 +1,210 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import config as C
+
+STATES = {"WALK": 0, "ATTACK": 1, "DEATH": 2}
+WALK = STATES["WALK"]
+DEATH = STATES["DEATH"]
+
+
+def horde_available():
+    return np is not None and C.ENEMY_SOA
+
+
+class EnemyStore:
+    # Guarda em arrays contíguos tudo o que um inimigo andando precisa por
+    # frame: posição, direção, velocidade, estado, cooldown, animação e célula
+    # do hash. Perseguição, integração, wrap e troca de frame rodam em lote;
+    # só os inimigos atacando ou morrendo passam pelo update do sprite.
+    def __init__(self, walk_delay, hash_cell, size, capacity=64):
+        self.walk_delay = walk_delay
+        self.hash_cell = hash_cell
+        self.half_size = np.array(size, dtype=float) / 2
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))
+        self.dir = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.state = np.full(capacity, DEATH, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.cool = np.zeros(capacity)
+        self.anim_timer = np.zeros(capacity)
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self.frame_count = np.ones(capacity, dtype=np.int32)
+        self.left = np.zeros(capacity, dtype=bool)
+        self.cell = np.zeros((capacity, 2), dtype=np.int64)
+        self.sprites = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+        self.bounds = np.array([C.WIDTH, C.HEIGHT], dtype=float)
+
+    def __len__(self):
+        return len(self.sprites) - len(self.free)
+
+    def add(self, sprite):
+        if not self.free:
+            self._grow()
+        slot = self.free.pop()
+        self.pos[slot] = sprite.pos
+        self.prev_pos[slot] = sprite.pos
+        self.dir[slot] = 0.0
+        self.speed[slot] = sprite.speed
+        self.state[slot] = STATES[sprite.state]
+        self.active[slot] = True
+        self.cool[slot] = sprite.attack_cool
+        self.anim_timer[slot] = sprite.anim_timer
+        self.frame[slot] = sprite.frame_index
+        self.frame_count[slot] = len(sprite.frames_walk["RIGHT"])
+        self.left[slot] = sprite.facing == "LEFT"
+        self.cell[slot] = sprite.hash_key if sprite.hash_key else (0, 0)
+        self.sprites[slot] = sprite
+        return slot
+
+    def remove(self, slot):
+        self.active[slot] = False
+        self.state[slot] = DEATH
+        self.sprites[slot] = None
+        self.free.append(slot)
+
+    def steer(self, target, attack_range, flow=None):
+        # devolve os sprites que chegaram ao alcance e podem atacar
+        idx = np.flatnonzero(self.active & (self.state != DEATH))
+        if idx.size == 0:
+            return []
+        pos = self.pos[idx]
+        diff = np.array((target[0], target[1])) - pos
+        dist = np.sqrt(diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1])
+
+        # dist >= 0, então quem não está perto está longe (e dist > 0); as
+        # direções saem inteiras de np.where e voltam num scatter só
+        near = dist <= attack_range
+        direction = diff / np.where(near, 1.0, dist)[:, None]
+        if flow is not None:
+            # longe do player: segue o campo de direções em volta das paredes
+            cells = flow.cells(pos)
+            use = ~near & flow.valid_mask[cells]
+            direction = np.where(use[:, None], flow.dirs[cells], direction)
+        direction[near] = 0.0
+        self.dir[idx] = direction
+
+        ready = idx[near & (self.state[idx] == WALK) & (self.cool[idx] <= 0)]
+        return [self.sprites[i] for i in ready]
+
+    def update(self, dt):
+        active = self.active
+        cooling = active & (self.cool > 0)
+        self.cool[cooling] -= dt
+
+        walking = np.flatnonzero(active & (self.state == WALK))
+        if walking.size == 0:
+            return
+        direction = self.dir[walking]
+        # um gather e um scatter só; o wrap é feito nas linhas que andaram
+        # (um passo nunca anda mais que uma tela) e sem np.mod, que é lento
+        pos = self.pos[walking]
+        pos += direction * self.speed[walking][:, None] * dt
+        bounds = self.bounds
+        np.add(pos, bounds, out=pos, where=pos < 0)
+        np.subtract(pos, bounds, out=pos, where=pos >= bounds)
+        self.pos[walking] = pos
+
+        old_left = self.left[walking]
+        left = np.where(direction[:, 0] < 0, True,
+                        np.where(direction[:, 0] > 0, False, old_left))
+        self.left[walking] = left
+
+        timer = self.anim_timer[walking] + dt
+        step = timer >= self.walk_delay
+        timer[step] = 0.0
+        self.anim_timer[walking] = timer
+        frame = self.frame[walking]
+        frame[step] = (frame[step] + 1) % self.frame_count[walking][step]
+        self.frame[walking] = frame
+
+        # pos já é >= 0: truncar e dividir inteiro dá o mesmo que key_for
+        cells = pos.astype(np.int64) // self.hash_cell
+        moved = np.any(cells != self.cell[walking], axis=1)
+        self.cell[walking] = cells
+
+        # o Vec pos do sprite só é copiado em pull() e o rect só é alinhado
+        # quando a colisão lê (Enemy.rect); nada por inimigo aqui
+        sprites = self.sprites
+        # como no update do sprite, a imagem só troca junto com o frame
+        for i, frame_index, is_left in zip(walking[step].tolist(),
+                                           frame[step].tolist(),
+                                           left[step].tolist()):
+            sprites[i].show_walk_frame(frame_index, is_left)
+
+        for i, key in zip(walking[moved].tolist(), cells[moved].tolist()):
+            sprites[i].move_hash_cell(tuple(key))
+
+    def snapshot(self):
+        np.copyto(self.prev_pos, self.pos)
+
+    def draw(self, surf, alpha):
+        # blita direto das posições, interpolando entre os dois últimos passos
+        idx = np.flatnonzero(self.active)
+        if idx.size == 0:
+            return
+        pos = self.pos[idx]
+        if alpha < 1.0:
+            prev = self.prev_pos[idx]
+            delta = pos - prev
+            # quem deu a volta na tela não é interpolado
+            wrapped = np.any(np.abs(delta) > self.bounds / 2, axis=1)
+            delta[wrapped] = 0.0
+            pos = np.where(wrapped[:, None], pos, prev + delta * alpha)
+        topleft = (pos - self.half_size).tolist()
+        sprites = self.sprites
+        surf.blits([(sprites[i].image, xy) for i, xy in zip(idx.tolist(), topleft)],
+                   doreturn=False)
+
+    def pull(self, sprite):
+        # sprite vai sair do andar: copia o estado que vivia nos arrays
+        slot = sprite.slot
+        sprite.pos.update(*self.pos[slot].tolist())
+        sprite.rect.center = sprite.pos
+        sprite.attack_cool = float(self.cool[slot])
+        sprite.facing = "LEFT" if self.left[slot] else "RIGHT"
+        sprite.frame_index = int(self.frame[slot])
+        sprite.anim_timer = float(self.anim_timer[slot])
+
+    def push(self, sprite):
+        # sprite voltou a andar: devolve o estado para os arrays
+        slot = sprite.slot
+        self.state[slot] = STATES[sprite.state]
+        self.cool[slot] = sprite.attack_cool
+        self.left[slot] = sprite.facing == "LEFT"
+        self.frame[slot] = sprite.frame_index
+        self.anim_timer[slot] = sprite.anim_timer
+
+    def set_state(self, slot, state):
+        self.state[slot] = STATES[state]
+
+    def others(self):
+        # sprites que não estão andando e ainda precisam do update próprio
+        idx = np.flatnonzero(self.active & (self.state != WALK))
+        return [self.sprites[i] for i in idx.tolist()]
+
+    def _grow(self):
+        old = len(self.sprites)
+        self.pos = _extend(self.pos, old, 0.0)
+        self.prev_pos = _extend(self.prev_pos, old, 0.0)
+        self.dir = _extend(self.dir, old, 0.0)
+        self.speed = _extend(self.speed, old, 0.0)
+        self.state = _extend(self.state, old, DEATH)
+        self.active = _extend(self.active, old, False)
+        self.cool = _extend(self.cool, old, 0.0)
+        self.anim_timer = _extend(self.anim_timer, old, 0.0)
+        self.frame = _extend(self.frame, old, 0)
+        self.frame_count = _extend(self.frame_count, old, 1)
+        self.left = _extend(self.left, old, False)
+        self.cell = _extend(self.cell, old, 0)
+        self.sprites.extend([None] * old)
+        self.free.extend(range(2 * old - 1, old - 1, -1))
+
+
+def _extend(arr, extra, fill):
+    tail = np.full((extra,) + arr.shape[1:], fill, dtype=arr.dtype)
+    return np.concatenate([arr, tail])
@@ -0,0 +1,57 @@
+class SpritePool:
+    # Sprites mortos voltam para cá em vez de virar lixo. O sprite precisa de
+    # reset(*args), que refaz o estado sem alocar Rect/Vec novos, e de chamar
+    # pool.release(self) no kill(). factory() cria um quando a pool está vazia.
+    def __init__(self, factory, prefill=0):
+        self.factory = factory
+        self.free = []
+        self.live = 0
+        self.high_water = 0
+        self.created = 0
+        self.reused = 0
+        self.misses = 0
+        for _ in range(prefill):
+            self.free.append(self._create())
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            self.reused += 1
+        else:
+            sprite = self._create()
+            self.misses += 1
+        sprite.in_pool = False
+        sprite.reset(*args)
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return sprite
+
+    def release(self, sprite):
+        if sprite.in_pool:
+            return
+        sprite.in_pool = True
+        self.free.append(sprite)
+        self.live -= 1
+
+    @property
+    def reuse_rate(self):
+        total = self.reused + self.misses
+        return self.reused / total if total else 0.0
+
+    def stats(self):
+        return {
+            "live": self.live,
+            "free": len(self.free),
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+            "reuse_rate": self.reuse_rate,
+        }
+
+    def _create(self):
+        sprite = self.factory()
+        sprite.pool = self
+        sprite.in_pool = True
+        self.created += 1
+        return sprite
@@ -0,0 +1,170 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame as pg
+
+import config as C
+import sound
+import systems
+from sprites import SPRITE_SETS, SINGLE_IMAGES
+from utils import (
+    FRAME_CACHE,
+    background_key,
+    cache_background,
+    decode_background,
+    frame_paths,
+    frames_key,
+    has_atlas,
+    image_key,
+    install_atlas,
+    load_animation_cached,
+    load_image_cached,
+    prepare_image,
+    read_atlas,
+    read_image,
+    report_missing_atlas,
+)
+
+GAMEOVER_PATH = str(systems.ASSETS_DIR / "gameover.gif")
+
+
+class AssetPreloader:
+    # Os workers só decodificam arquivos; convert_alpha e a escrita nos caches
+    # acontecem em poll(), na thread principal.
+    def __init__(self, workers=C.PRELOAD_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = []
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.t_start = time.perf_counter()
+        self.elapsed = None
+
+    def add(self, job, finish, *args):
+        future = self.executor.submit(job, *args)
+        self.pending.append((future, finish))
+        self.total += 1
+
+    def poll(self):
+        # um finish pode enfileirar outro job (fundo em streaming): os novos
+        # entram em self.pending enquanto a lista antiga é percorrida
+        pending, self.pending = self.pending, []
+        still_pending = []
+        for future, finish in pending:
+            if future.done():
+                self._finish(future, finish)
+            else:
+                still_pending.append((future, finish))
+        self.pending = still_pending + self.pending
+        self._check_finished()
+        return self.progress
+
+    def wait(self):
+        while self.pending:
+            pending, self.pending = self.pending, []
+            for future, finish in pending:
+                self._finish(future, finish)
+        self._check_finished()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def progress(self):
+        if self.total == 0:
+            return 1.0
+        return self.done / self.total
+
+    @property
+    def finished(self):
+        return not self.pending
+
+    def _finish(self, future, finish):
+        try:
+            finish(future.result())
+        except Exception as e:
+            self.failed += 1
+            print(f"[ERRO] Pré-carregamento falhou: {e}")
+        self.done += 1
+
+    def _check_finished(self):
+        if self.pending or self.elapsed is not None:
+            return
+        # o executor continua vivo: os fundos em streaming usam os workers
+        self.elapsed = time.perf_counter() - self.t_start
+        print(f"[PERF] {self.done} assets pré-carregados em {self.elapsed * 1000:.0f} ms")
+
+
+def _read_images(paths):
+    return [read_image(path) for path in paths]
+
+
+def _finish_frames(key, size, color):
+    def finish(raw_frames):
+        frames = [prepare_image(img, size, color) for img in raw_frames]
+        FRAME_CACHE.put(key, frames)
+    return finish
+
+
+def _finish_image(path, size, color):
+    def finish(img):
+        FRAME_CACHE.put(image_key(path, size), [prepare_image(img, size, color)])
+    return finish
+
+
+def _finish_atlas(images):
+    def finish(data):
+        install_atlas(data)
+        # recortar as subsurfaces já aquece o cache de frames
+        for folder, names, size, color in SPRITE_SETS:
+            load_animation_cached(folder, names, size, color)
+        for path, size, color in images:
+            load_image_cached(path, size, color)
+    return finish
+
+
+def _finish_background(key, preloader):
+    def finish(source):
+        source.to_display(preloader)
+        cache_background(key, source)
+    return finish
+
+
+def _finish_sound(filename):
+    def finish(snd):
+        sound.cache_sound(filename, snd)
+    return finish
+
+
+def preload_game_assets(preloader=None):
+    if preloader is None:
+        preloader = AssetPreloader()
+
+    screen_size = (C.WIDTH, C.HEIGHT)
+    for path in systems.MAP_PATHS + [GAMEOVER_PATH]:
+        key = background_key(path, screen_size)
+        preloader.add(decode_background, _finish_background(key, preloader), path, screen_size, key[2])
+
+    images = SINGLE_IMAGES + [
+        (path, systems.HP_SIZE, color) for path, color in systems.HP_IMAGES.values()
+    ]
+    if has_atlas():
+        preloader.add(read_atlas, _finish_atlas(images))
+    else:
+        report_missing_atlas()
+        for folder, names, size, color in SPRITE_SETS:
+            key = frames_key(folder, names, size)
+            preloader.add(_read_images, _finish_frames(key, size, color), frame_paths(folder, names))
+        for path, size, color in images:
+            preloader.add(read_image, _finish_image(path, size, color), path)
+
+    try:
+        if not pg.mixer.get_init():
+            pg.mixer.init()
+    except pg.error as e:
+        print(f"[ERRO] Mixer indisponível, sons não pré-carregados: {e}")
+        return preloader
+    for filename in sound.SFX_FILES:
+        preloader.add(sound.read_sound, _finish_sound(filename), filename)
+
+    return preloader
@@ -0,0 +1,175 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame as pg
+
+import config as C
+
+PHASES = ("events", "update", "collisions", "background", "sprites", "hud", "flip")
+COLUMNS = ("frame", "total_ms") + tuple(f"{phase}_ms" for phase in PHASES)
+
+PHASE_COLORS = {
+    "events": (160, 160, 160),
+    "update": (80, 160, 255),
+    "collisions": (255, 90, 90),
+    "background": (90, 200, 90),
+    "sprites": (255, 200, 60),
+    "hud": (200, 110, 255),
+    "flip": (255, 140, 40),
+}
+
+
+def percentile(sorted_values, pct):
+    # nearest-rank, sem interpolar: bom o bastante para ms por frame
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class NullProfiler:
+    # usado pelo World quando ninguém mede (headless, benchmarks)
+    def lap(self, phase):
+        pass
+
+
+class FrameProfiler:
+    # Cronometra as fases de cada frame por "voltas": lap(fase) soma à fase o
+    # tempo desde a volta anterior. Custa um perf_counter e uma soma por fase,
+    # então fica sempre ligado; overlay e arquivo são opcionais.
+    def __init__(self, window=C.PROFILE_WINDOW, log_path=None):
+        self.window = window
+        self.samples = {phase: deque(maxlen=window) for phase in PHASES}
+        self.totals = deque(maxlen=window)
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame = 0
+        self.t_frame = self.t_lap = time.perf_counter()
+        self.stats = {}
+        self.show = False
+        self.graph = None
+
+        self.log_path = log_path
+        self.logged = 0
+        self.log_file = None
+        self.csv = None
+        self.records = None
+        if log_path:
+            self.open_log(log_path)
+
+    def begin_frame(self):
+        self.t_frame = self.t_lap = time.perf_counter()
+        for phase in PHASES:
+            self.current[phase] = 0.0
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.current[phase] += now - self.t_lap
+        self.t_lap = now
+
+    def end_frame(self):
+        total = (self.t_lap - self.t_frame) * 1000.0
+        self.totals.append(total)
+        row = [self.frame, round(total, 4)]
+        for phase in PHASES:
+            ms = self.current[phase] * 1000.0
+            self.samples[phase].append(ms)
+            row.append(round(ms, 4))
+        if self.csv is not None:
+            self.csv.writerow(row)
+            self.logged += 1
+        elif self.records is not None:
+            self.records.append(row)
+            self.logged += 1
+        if self.show:
+            self._push_graph_column()
+            if self.frame % C.PROFILE_STATS_EVERY == 0:
+                self.stats = self.summary()
+        self.frame += 1
+
+    def summary(self):
+        # p50/p95/p99 em ms da janela atual, por fase e do frame inteiro
+        result = {}
+        for name, values in [("frame", self.totals)] + [(p, self.samples[p]) for p in PHASES]:
+            ordered = sorted(values)
+            result[name] = tuple(percentile(ordered, pct) for pct in (50, 95, 99))
+        return result
+
+    def toggle(self):
+        self.show = not self.show
+        if self.show:
+            self.stats = self.summary()
+
+    def open_log(self, path):
+        # .json junta tudo e grava no close(); qualquer outra extensão vira CSV
+        self.close()
+        self.log_path = path
+        self.logged = 0
+        if path.endswith(".json"):
+            self.records = []
+            return
+        self.log_file = open(path, "w", newline="", encoding="utf-8")
+        self.csv = csv.writer(self.log_file)
+        self.csv.writerow(COLUMNS)
+
+    def close(self):
+        if self.records is not None:
+            with open(self.log_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "columns": COLUMNS,
+                    "frames": self.records,
+                    "summary": {k: dict(zip(("p50", "p95", "p99"), v))
+                                for k, v in self.summary().items()},
+                }, f)
+            self.records = None
+        elif self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+            self.csv = None
+        else:
+            return
+        print(f"[PERF] {self.logged} frames salvos em {self.log_path}")
+
+    def _push_graph_column(self):
+        # o gráfico rola 1px por frame; só a coluna nova é desenhada
+        w, h = C.PROFILE_GRAPH_SIZE
+        if self.graph is None:
+            self.graph = pg.Surface((w, h), pg.SRCALPHA)
+            self.graph.fill((0, 0, 0, 160))
+        self.graph.scroll(-1, 0)
+        x = w - 1
+        self.graph.fill((0, 0, 0, 160), (x, 0, 1, h))
+        scale = h / C.PROFILE_GRAPH_MS
+        y = h
+        for phase in PHASES:
+            bar = int(self.current[phase] * 1000.0 * scale + 0.5)
+            if bar <= 0:
+                continue
+            top = max(0, y - bar)
+            self.graph.fill(PHASE_COLORS[phase], (x, top, 1, y - top))
+            y = top
+            if y == 0:
+                break
+
+    def draw(self, surf, font):
+        if not self.show:
+            return
+        w, h = C.PROFILE_GRAPH_SIZE
+        x0 = 20
+        y0 = surf.get_height() - h - 20
+        if self.graph is not None:
+            surf.blit(self.graph, (x0, y0))
+        # linha do orçamento de 60 FPS
+        budget_y = y0 + h - int(1000.0 / C.FPS * h / C.PROFILE_GRAPH_MS)
+        pg.draw.line(surf, C.WHITE, (x0, budget_y), (x0 + w - 1, budget_y))
+
+        y = y0 - 20 * (len(PHASES) + 1) - 4
+        for name in ("frame",) + PHASES:
+            p50, p95, p99 = self.stats.get(name, (0.0, 0.0, 0.0))
+            color = PHASE_COLORS.get(name, C.WHITE)
+            label = font.render(
+                f"{name:<10} {p50:6.2f} {p95:6.2f} {p99:6.2f}", True, color
+            )
+            surf.blit(label, (x0, y))
+            y += 20
@@ -0,0 +1,191 @@
+# Gravação e replay determinístico de partidas. Grave com REPLAY_RECORD no
+# config e reproduza sem tela, o mais rápido possível:
+#   python replay.py partida.iwr
+#   python replay.py partida.iwr --draw
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+import config as C
+from controls import InputState
+
+MAGIC = b"IWR1"
+HEADER = struct.Struct("<4sH")
+
+# cada registro começa com uma tag de 1 byte
+TAG_WORLD = 0    # World novo: seed
+TAG_STEP = 1     # um passo: dt, held, pressed, released
+TAG_REPEAT = 2   # N passos iguais ao último, sem bordas
+TAG_CHECK = 3    # checksum do estado após o passo N
+
+WORLD = struct.Struct("<BI")
+STEP = struct.Struct("<BdBBB")
+REPEAT = struct.Struct("<BH")
+CHECK = struct.Struct("<BII")
+
+MAX_REPEAT = 0xFFFF
+
+
+def world_checksum(world):
+    # CRC do que define a partida: player, placar e cada inimigo na ordem de spawn
+    player = world.player
+    crc = zlib.crc32(struct.pack(
+        "<ddiiii", player.pos.x, player.pos.y,
+        world.score, world.lives, world.wave, len(world.enemies),
+    ))
+    for enemy in world.enemies:
+        x, y = enemy.rect.center
+        crc = zlib.crc32(struct.pack("<iii", x, y, enemy.hp), crc)
+        crc = zlib.crc32(enemy.state.encode(), crc)
+    return crc
+
+
+class ReplayRecorder:
+    # Escreve a partida num log binário compacto. Passos sem bordas e com o
+    # mesmo dt e as mesmas teclas do anterior viram um contador de repetição.
+    def __init__(self, path, check_every=C.REPLAY_CHECK_EVERY):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, 1))
+        self.check_every = check_every
+        self.steps = 0
+        self.last = None
+        self.repeat = 0
+
+    def new_world(self, seed):
+        self._flush_repeat()
+        self.last = None
+        self.file.write(WORLD.pack(TAG_WORLD, seed))
+
+    def step(self, dt, inp, world):
+        key = (dt, inp.held)
+        if key == self.last and not (inp.pressed or inp.released):
+            self.repeat += 1
+            if self.repeat == MAX_REPEAT:
+                self._flush_repeat()
+        else:
+            self._flush_repeat()
+            self.file.write(STEP.pack(TAG_STEP, dt, inp.held, inp.pressed, inp.released))
+            self.last = key
+        self.steps += 1
+        if self.steps % self.check_every == 0:
+            self._flush_repeat()
+            self.file.write(CHECK.pack(TAG_CHECK, self.steps, world_checksum(world)))
+
+    def close(self):
+        if self.file is None:
+            return
+        self._flush_repeat()
+        self.file.close()
+        self.file = None
+        print(f"[PERF] {self.steps} passos gravados em {self.path}")
+
+    def _flush_repeat(self):
+        if self.repeat:
+            self.file.write(REPEAT.pack(TAG_REPEAT, self.repeat))
+            self.repeat = 0
+
+
+def read_replay(path):
+    # devolve os registros como tuplas (tag, ...)
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != 1:
+        raise ValueError(f"{path} não é um replay válido")
+    records = []
+    offset = HEADER.size
+    layouts = {TAG_WORLD: WORLD, TAG_STEP: STEP, TAG_REPEAT: REPEAT, TAG_CHECK: CHECK}
+    while offset < len(data):
+        layout = layouts[data[offset]]
+        records.append(layout.unpack_from(data, offset))
+        offset += layout.size
+    return records
+
+
+def replay(path, draw=False):
+    import pygame as pg
+
+    from headless import SimClock, make_world
+
+    records = read_replay(path)
+    screen = pg.display.get_surface()
+    font = pg.font.Font(None, 20) if draw else None
+    clock = SimClock()
+
+    world = None
+    inp = None
+    steps = 0
+    worlds = 0
+    checks = 0
+    diverged = None
+
+    def advance(dt, state):
+        world.update(dt, state)
+        clock.elapsed_ms += dt * 1000.0
+        if draw:
+            world.draw(screen, font)
+
+    t0 = time.perf_counter()
+    for record in records:
+        tag = record[0]
+        if tag == TAG_WORLD:
+            # como no Game: só a primeira partida cria o World
+            if world is None:
+                world = make_world(clock, seed=record[1])
+            else:
+                world.reset(record[1])
+            worlds += 1
+        elif tag == TAG_STEP:
+            _, dt, held, pressed, released = record
+            inp = InputState(held, pressed, released)
+            advance(dt, inp)
+            steps += 1
+        elif tag == TAG_REPEAT:
+            settled = inp.settled()
+            for _ in range(record[1]):
+                advance(dt, settled)
+            steps += record[1]
+        elif tag == TAG_CHECK:
+            checks += 1
+            if diverged is None and world_checksum(world) != record[2]:
+                diverged = record[1]
+    wall = time.perf_counter() - t0
+
+    return {
+        "steps": steps,
+        "worlds": worlds,
+        "checks": checks,
+        "diverged": diverged,
+        "wall_s": wall,
+        "steps_per_s": steps / wall if wall > 0 else float("inf"),
+        "sim_s": clock.elapsed_ms / 1000.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--draw", action="store_true", help="desenha numa surface offscreen")
+    args = parser.parse_args(argv)
+
+    from headless import init_headless
+
+    init_headless()
+    r = replay(args.path, args.draw)
+    print(
+        f"{r['steps']} passos ({r['worlds']} partidas) em {r['wall_s']:.2f} s -> "
+        f"{r['steps_per_s']:.0f} passos/s ({r['sim_s'] / r['wall_s']:.1f}x tempo real)"
+    )
+    if r["diverged"] is None:
+        print(f"{r['checks']} checksums conferem")
+    else:
+        print(f"[ERRO] Replay divergiu no passo {r['diverged']}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
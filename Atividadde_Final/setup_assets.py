@@ -1,6 +1,10 @@
+import json
 import os
 import pygame as pg
 
+from sprites import SPRITE_SETS, SINGLE_IMAGES
+from utils import ATLAS_IMAGE, ATLAS_INDEX, atlas_key, frame_paths
+
 pg.init()
 pg.font.init()
 
@@ -15,6 +19,7 @@ barras = [
 ]
 
 font = pg.font.SysFont("Arial", 20, bold=True)
+atlas_itens = []
 
 for nome, cor in barras:
     surf = pg.Surface((150, 40))
@@ -29,7 +34,47 @@ for nome, cor in barras:
     
     caminho = os.path.join("assets", nome)
     pg.image.save(surf, caminho)
+    atlas_itens.append((caminho, (150, 40)))
     print(f"Imagem criada: {caminho}")
 
+# Atlas: todos os frames já no tamanho usado em jogo, numa imagem só
+for pasta, nomes, tamanho, _ in SPRITE_SETS:
+    for caminho in frame_paths(pasta, nomes):
+        atlas_itens.append((caminho, tamanho))
+for caminho, tamanho, _ in SINGLE_IMAGES:
+    atlas_itens.append((caminho, tamanho))
+
+ATLAS_LARGURA = 512
+frames = []
+for caminho, tamanho in atlas_itens:
+    if not os.path.exists(caminho):
+        print(f"Frame ausente, fica fora do atlas: {caminho}")
+        continue
+    img = pg.transform.scale(pg.image.load(caminho), tamanho)
+    frames.append((atlas_key(caminho), img))
+
+# empacota em prateleiras, dos frames mais altos para os mais baixos
+frames.sort(key=lambda f: f[1].get_height(), reverse=True)
+rects = {}
+x = y = altura_linha = 0
+for chave, img in frames:
+    w, h = img.get_size()
+    if x + w > ATLAS_LARGURA:
+        x = 0
+        y += altura_linha + 1
+        altura_linha = 0
+    rects[chave] = [x, y, w, h]
+    x += w + 1
+    altura_linha = max(altura_linha, h)
+
+atlas = pg.Surface((ATLAS_LARGURA, y + altura_linha), pg.SRCALPHA)
+for chave, img in frames:
+    atlas.blit(img, rects[chave][:2])
+pg.image.save(atlas, ATLAS_IMAGE)
+
+with open(ATLAS_INDEX, "w", encoding="utf-8") as f:
+    json.dump({"frames": rects}, f, sort_keys=True)
+print(f"Atlas criado: {ATLAS_IMAGE} ({len(rects)} frames)")
+
 print("\nSucesso! Agora rode o main.py")
 pg.quit()
\ No newline at end of file
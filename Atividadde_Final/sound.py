@@ -6,6 +6,118 @@ BASE_DIR = Path(__file__).resolve().parent
 ASSETS_DIR = BASE_DIR / "assets"
 SOUNDS_DIR = ASSETS_DIR / "sounds"
 
+SFX_FILES = ["ataque.mp3", "spawnzumbi.mp3", "morte.mp3"]
+
+# canais reservados por categoria
+VOICE_CATEGORIES = {"player": 3, "enemy": 5}
+
+# som: (arquivo, categoria, vozes simultâneas, janela de junção em ms, prioridade)
+VOICE_SPECS = {
+    "attack": ("ataque.mp3", "player", 2, 40, 2),
+    "hit": ("morte.mp3", "player", 1, 100, 3),
+    "spawn": ("spawnzumbi.mp3", "enemy", 2, 120, 0),
+    "death": ("morte.mp3", "enemy", 3, 60, 1),
+}
+
+_SOUNDS = {}
+
+
+def read_sound(filename):
+    try:
+        return pg.mixer.Sound(str(SOUNDS_DIR / filename))
+    except Exception:
+        return None
+
+
+def cache_sound(filename, snd):
+    _SOUNDS[filename] = snd
+
+
+def load_sound(filename):
+    if filename not in _SOUNDS:
+        cache_sound(filename, read_sound(filename))
+    return _SOUNDS[filename]
+
+
+class VoiceManager:
+    # Decide quem toca. Cada categoria tem seus próprios canais do mixer; um
+    # som repetido dentro da janela é juntado ao que já está tocando, e cada
+    # som tem um teto de vozes. Canal cheio: rouba a voz de menor prioridade
+    # se a nova for mais importante, senão descarta.
+    def __init__(self, categories, specs, sounds):
+        total = sum(categories.values())
+        if pg.mixer.get_num_channels() < total:
+            pg.mixer.set_num_channels(total)
+        pg.mixer.set_reserved(total)
+
+        # cada voz: [canal, som tocando, prioridade]
+        self.voices = {}
+        first = 0
+        for category, count in categories.items():
+            self.voices[category] = [
+                [pg.mixer.Channel(i), None, -1] for i in range(first, first + count)
+            ]
+            first += count
+
+        self.specs = specs
+        self.sounds = sounds
+        self.last_play = {}
+        self.counters = {
+            name: {"played": 0, "coalesced": 0, "dropped": 0, "stolen": 0}
+            for name in specs
+        }
+
+    def play(self, name):
+        snd = self.sounds.get(name)
+        if snd is None:
+            return False
+        category, max_voices, window_ms, priority = self.specs[name]
+        counters = self.counters[name]
+
+        now = pg.time.get_ticks()
+        last = self.last_play.get(name)
+        if last is not None and now - last < window_ms:
+            counters["coalesced"] += 1
+            return False
+
+        free = None
+        victim = None
+        same = 0
+        for voice in self.voices[category]:
+            if not voice[0].get_busy():
+                if free is None:
+                    free = voice
+                continue
+            if voice[1] == name:
+                same += 1
+            if victim is None or voice[2] < victim[2]:
+                victim = voice
+
+        if same >= max_voices:
+            counters["dropped"] += 1
+            return False
+        if free is None:
+            if victim is None or victim[2] >= priority:
+                counters["dropped"] += 1
+                return False
+            victim[0].stop()
+            counters["stolen"] += 1
+            free = victim
+
+        free[0].play(snd)
+        free[1] = name
+        free[2] = priority
+        self.last_play[name] = now
+        counters["played"] += 1
+        return True
+
+    def stats(self):
+        totals = {"played": 0, "coalesced": 0, "dropped": 0, "stolen": 0}
+        for counters in self.counters.values():
+            for key, value in counters.items():
+                totals[key] += value
+        return {"total": totals, "sounds": self.counters}
+
 
 class SoundManager:
     def __init__(self):
@@ -14,19 +126,20 @@ class SoundManager:
 
         self.sfx_vol = C.MASTER_VOLUME * C.SFX_VOLUME_RATIO
 
-        self.s_attack = self._load_sound("ataque.mp3")
-        self.s_spawn = self._load_sound("spawnzumbi.mp3")
-        self.s_death = self._load_sound("morte.mp3")
-        self.s_hit = self._load_sound("morte.mp3") 
+        sounds = {
+            name: self._load_sound(spec[0]) for name, spec in VOICE_SPECS.items()
+        }
+        self.voices = VoiceManager(
+            VOICE_CATEGORIES,
+            {name: spec[1:] for name, spec in VOICE_SPECS.items()},
+            sounds,
+        )
 
     def _load_sound(self, filename):
-        path = SOUNDS_DIR / filename
-        try:
-            snd = pg.mixer.Sound(str(path))
+        snd = load_sound(filename)
+        if snd:
             snd.set_volume(self.sfx_vol)
-            return snd
-        except Exception as e:
-            return None
+        return snd
 
     def start_music(self):
         music_path = SOUNDS_DIR / "somdefundo.mp3"
@@ -41,20 +154,43 @@ class SoundManager:
             print(f"[ERRO] Não carregou música de fundo: {music_path} -> {e}")
 
     def play_attack(self):
-        if self.s_attack:
-            self.s_attack.play()
+        self.voices.play("attack")
 
     def play_sword(self):
         self.play_attack()
 
     def play_enemy_spawn(self):
-        if self.s_spawn:
-            self.s_spawn.play()
+        self.voices.play("spawn")
+
+    def play_enemy_death(self):
+        self.voices.play("death")
+
+    def play_player_hit(self):
+        self.voices.play("hit")
+
+    def stats(self):
+        return self.voices.stats()
+
+
+class NullSound:
+    # Mesmo contrato do SoundManager, sem mixer: para rodar sem placa de som.
+    def start_music(self):
+        pass
+
+    def play_attack(self):
+        pass
+
+    def play_sword(self):
+        pass
+
+    def play_enemy_spawn(self):
+        pass
 
     def play_enemy_death(self):
-        if self.s_death:
-            self.s_death.play()
+        pass
 
     def play_player_hit(self):
-        if self.s_hit:
-            self.s_hit.play()
\ No newline at end of file
+        pass
+
+    def stats(self):
+        return {}
@@ -0,0 +1,180 @@
+from bisect import bisect_left
+
+import pygame as pg
+
+
+def cell_range(rect, cell_size):
+    x0 = rect.left // cell_size
+    x1 = (rect.right - 1) // cell_size
+    y0 = rect.top // cell_size
+    y1 = (rect.bottom - 1) // cell_size
+    return x0, x1, y0, y1
+
+
+def union_area(rects):
+    # área coberta por retângulos que podem se sobrepor: comprime as
+    # coordenadas e soma só as células da grade que algum deles cobre
+    if not rects:
+        return 0
+    xs = sorted({x for r in rects for x in (r.left, r.right)})
+    ys = sorted({y for r in rects for y in (r.top, r.bottom)})
+    covered = [bytearray(len(xs) - 1) for _ in range(len(ys) - 1)]
+    for r in rects:
+        i0, i1 = bisect_left(xs, r.left), bisect_left(xs, r.right)
+        for j in range(bisect_left(ys, r.top), bisect_left(ys, r.bottom)):
+            covered[j][i0:i1] = b"\x01" * (i1 - i0)
+    total = 0
+    for j, row in enumerate(covered):
+        height = ys[j + 1] - ys[j]
+        total += height * sum(xs[i + 1] - xs[i] for i, cell in enumerate(row) if cell)
+    return total
+
+
+def coalesce_rects(rects):
+    # Junta as paredes num conjunto menor que cobre exatamente a mesma área:
+    # descarta as que estão dentro de outra e funde pares cuja união já é um
+    # retângulo (lado a lado ou sobrepostas e alinhadas). As que sobram podem
+    # se sobrepor de propósito: as paredes clicadas se sobrepõem tanto que
+    # qualquer partição sem sobreposição sai maior que a entrada. Cada passo
+    # tira um retângulo, então a saída nunca é maior; `bench.py walls`
+    # confere contagem e área.
+    merged = []
+    for r in sorted(rects, key=lambda r: -r.width * r.height):
+        if r.width > 0 and r.height > 0 and not any(m.contains(r) for m in merged):
+            merged.append(pg.Rect(r))
+
+    changed = True
+    while changed:
+        changed = False
+        for i, a in enumerate(merged):
+            for j in range(i + 1, len(merged)):
+                b = merged[j]
+                u = a.union(b)
+                inter = a.clip(b)
+                if u.width * u.height == (a.width * a.height + b.width * b.height
+                                          - inter.width * inter.height):
+                    merged[i] = u
+                    del merged[j]
+                    # quem cabia dentro do novo retângulo sai também
+                    merged[:] = [m for k, m in enumerate(merged) if k == i or not u.contains(m)]
+                    changed = True
+                    break
+            if changed:
+                break
+
+    return merged
+
+
+class StaticGrid:
+    # Índice uniforme para geometria que não se move (paredes do mapa).
+    def __init__(self, rects, cell_size):
+        self.rects = rects
+        self.cell_size = cell_size
+        self.cells = {}
+        for i, rect in enumerate(rects):
+            x0, x1, y0, y1 = cell_range(rect, cell_size)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self.cells.setdefault((cx, cy), []).append(i)
+
+    def candidates(self, rect):
+        found = set()
+        x0, x1, y0, y1 = cell_range(rect, self.cell_size)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                found.update(self.cells.get((cx, cy), ()))
+        return found
+
+    def query(self, rect):
+        return [self.rects[i] for i in sorted(self.candidates(rect))
+                if rect.colliderect(self.rects[i])]
+
+    def collides(self, rect):
+        x0, x1, y0, y1 = cell_range(rect, self.cell_size)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for i in self.cells.get((cx, cy), ()):
+                    if rect.colliderect(self.rects[i]):
+                        return True
+        return False
+
+
+class WallMap:
+    # Paredes de um mapa já juntadas por coalesce_rects. Os retângulos podem
+    # se sobrepor: collides/query não ligam, e quem soma área (FlowGrid) usa
+    # union_area.
+    def __init__(self, rects, cell_size, screen_size):
+        raw = [pg.Rect(r) for r in rects]
+        self.raw_count = len(raw)
+        self.rects = coalesce_rects(raw)
+        self.grid = StaticGrid(self.rects, cell_size)
+        self.screen_size = screen_size
+        self._overlay = None
+
+    def overlay(self):
+        # debug das paredes (tecla H) pré-renderizado numa única surface
+        if self._overlay is None:
+            self._overlay = pg.Surface(self.screen_size, pg.SRCALPHA)
+            for rect in self.rects:
+                self._overlay.fill((255, 0, 0, 128), rect)
+            if pg.display.get_surface() is not None:
+                self._overlay = self._overlay.convert_alpha()
+        return self._overlay
+
+    def __len__(self):
+        return len(self.rects)
+
+    def collides(self, rect):
+        return self.grid.collides(rect)
+
+    def query(self, rect):
+        return self.grid.query(rect)
+
+
+class SpatialHash:
+    # Hash uniforme para objetos que se movem. Cada objeto fica só na célula
+    # do seu centro e avisa quando troca de célula, então nada é reconstruído
+    # por frame; as consultas expandem o retângulo pela metade do maior objeto.
+    def __init__(self, cell_size, margin):
+        self.cell_size = cell_size
+        self.margin = margin
+        self.cells = {}
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.cells.values())
+
+    def key_for(self, pos):
+        return (int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size)
+
+    def insert(self, item, key):
+        bucket = self.cells.get(key)
+        if bucket is None:
+            bucket = self.cells[key] = {}
+        bucket[item] = None
+
+    def remove(self, item, key):
+        bucket = self.cells.get(key)
+        if bucket is not None:
+            bucket.pop(item, None)
+            if not bucket:
+                del self.cells[key]
+
+    def move(self, item, old_key, new_key):
+        self.remove(item, old_key)
+        self.insert(item, new_key)
+
+    def clear(self):
+        self.cells.clear()
+
+    def query(self, rect):
+        found = []
+        x0, x1, y0, y1 = cell_range(rect.inflate(self.margin * 2, self.margin * 2),
+                                    self.cell_size)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    for item in bucket:
+                        if rect.colliderect(item.rect):
+                            found.append(item)
+        return found
@@ -4,15 +4,33 @@ from random import uniform
 import pygame as pg
 
 import config as C
+from controls import LEFT, RIGHT, UP, DOWN
 from utils import (
     Vec,
     wrap_pos,
-    load_image,
     load_gif_frames,
-    load_animation_from_folder,
-    load_animation_from_folder_list,
+    load_animation_cached,
+    load_animation_bank,
+    load_image_cached,
 )
 
+PLAYER_SIZE = (50, 50)
+PLAYER_NAMES = ["0", "1", "2"]
+IDLE_FOLDER = os.path.join("assets", "parado")
+WALK_RIGHT_FOLDER = os.path.join("assets", "direita")
+WALK_LEFT_FOLDER = os.path.join("assets", "esquerda")
+KILL_RIGHT_PATH = os.path.join("assets", "percival_mata_direita.png")
+KILL_LEFT_PATH = os.path.join("assets", "percival_mata_esquerda.png")
+
+SWORD_SIZE = (60, 60)
+SWORD_FOLDER = os.path.join("assets", "espada")
+SWORD_NAMES = {
+    "RIGHT": ["espada_pra_direita_1", "espada_pra_direita_2"],
+    "LEFT": ["espada_pra_esquerda_1", "espada_pra_esquerda_2"],
+    "UP": ["espada_pra_cima_1", "espada_pra_cima_2"],
+    "DOWN": ["espada_pra_baixo_1", "espada_pra_baixo_2"],
+}
+
 VAMPIRE_FOLDER = os.path.join("assets", "vampire", "v1")
 SKELETON_FOLDER = os.path.join("assets", "skeleton1", "v1")
 
@@ -32,19 +50,46 @@ SKELETON_NAMES = [
 
 ENEMY_SIZE = (50, 50)
 ENEMY_DELAY = 0.12
+ENEMY_WALK_DELAY = 0.18
+
+# (pasta, nomes, tamanho, cor de fallback) de cada animação usada em jogo
+SPRITE_SETS = [
+    (IDLE_FOLDER, PLAYER_NAMES, PLAYER_SIZE, (0, 255, 0)),
+    (WALK_RIGHT_FOLDER, PLAYER_NAMES, PLAYER_SIZE, (0, 0, 255)),
+    (WALK_LEFT_FOLDER, PLAYER_NAMES, PLAYER_SIZE, (0, 0, 255)),
+    (VAMPIRE_FOLDER, VAMPIRE_NAMES, ENEMY_SIZE, (255, 0, 0)),
+    (SKELETON_FOLDER, SKELETON_NAMES, ENEMY_SIZE, (255, 0, 0)),
+] + [
+    (SWORD_FOLDER, names, SWORD_SIZE, (0, 255, 0))
+    for names in SWORD_NAMES.values()
+]
+
+SINGLE_IMAGES = [
+    (KILL_RIGHT_PATH, PLAYER_SIZE, (255, 0, 0)),
+    (KILL_LEFT_PATH, PLAYER_SIZE, (255, 0, 0)),
+]
 
 
 class Sword(pg.sprite.Sprite):
     def __init__(self, player, facing, frames):
         super().__init__()
+        self.pool = None
+        self.in_pool = False
+        self.rect = frames[0].get_rect()
+        self.reset(player, facing, frames)
+
+    def reset(self, player, facing, frames):
+        # chamado também pela SpritePool ao reaproveitar uma espada
         self.player = player
         self.facing = facing
         self.frames = frames
         self.frame_index = 0
         self.anim_timer = 0.0
         self.anim_delay = 0.1
+        self.prev_center = None
 
         self.image = self.frames[0]
+        self.rect.size = self.image.get_size()
         self.update_position()
 
     def update_position(self):
@@ -52,13 +97,13 @@ class Sword(pg.sprite.Sprite):
         cx, cy = self.player.rect.centerx, self.player.rect.centery
 
         if self.facing == "RIGHT":
-            self.rect = self.image.get_rect(center=(cx + offset, cy))
+            self.rect.center = (cx + offset, cy)
         elif self.facing == "LEFT":
-            self.rect = self.image.get_rect(center=(cx - offset, cy))
+            self.rect.center = (cx - offset, cy)
         elif self.facing == "UP":
-            self.rect = self.image.get_rect(center=(cx, cy - offset))
+            self.rect.center = (cx, cy - offset)
         elif self.facing == "DOWN":
-            self.rect = self.image.get_rect(center=(cx, cy + offset))
+            self.rect.center = (cx, cy + offset)
 
     def update(self, dt):
         self.update_position()
@@ -73,10 +118,40 @@ class Sword(pg.sprite.Sprite):
                 self.image = self.frames[self.frame_index]
                 self.update_position()
 
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
 
 class Player(pg.sprite.Sprite):
     def __init__(self, pos: Vec):
         super().__init__()
+        idle = load_animation_bank(IDLE_FOLDER, PLAYER_NAMES, PLAYER_SIZE, (0, 255, 0))
+        self.frames_idle_right = idle["RIGHT"]
+        self.frames_idle_left = idle["LEFT"]
+        
+        self.frames_walk_right = load_animation_cached(
+            WALK_RIGHT_FOLDER, PLAYER_NAMES, PLAYER_SIZE, (0, 0, 255)
+        )
+        self.frames_walk_left = load_animation_cached(
+            WALK_LEFT_FOLDER, PLAYER_NAMES, PLAYER_SIZE, (0, 0, 255)
+        )
+        
+        self.img_kill_right = load_image_cached(KILL_RIGHT_PATH, PLAYER_SIZE, (255, 0, 0))
+        self.img_kill_left = load_image_cached(KILL_LEFT_PATH, PLAYER_SIZE, (255, 0, 0))
+
+        self.sword_frames = {
+            facing: load_animation_cached(SWORD_FOLDER, names, SWORD_SIZE)
+            for facing, names in SWORD_NAMES.items()
+        }
+
+        self.image = self.frames_idle_right[0]
+        self.rect = self.image.get_rect(center=pos)
+        self.reset(pos)
+
+    def reset(self, pos: Vec):
+        # estado de começo de partida; os frames carregados ficam
         self.pos = Vec(pos)
         self.vel = Vec(0, 0)
         self.angle = 0.0
@@ -88,64 +163,25 @@ class Player(pg.sprite.Sprite):
         self.is_attacking = False
         self.kill_timer = 0.0
 
-        size = (50, 50)
-
-        self.frames_idle_right = load_animation_from_folder(
-            os.path.join("assets", "parado"), size, 3, (0, 255, 0)
-        )
-        self.frames_idle_left = [
-            pg.transform.flip(img, True, False) for img in self.frames_idle_right
-        ]
-        
-        self.frames_walk_right = load_animation_from_folder(
-            os.path.join("assets", "direita"), size, 3, (0, 0, 255)
-        )
-        self.frames_walk_left = load_animation_from_folder(
-            os.path.join("assets", "esquerda"), size, 3, (0, 0, 255)
-        )
-        
-        self.img_kill_right = load_image(
-            os.path.join("assets", "percival_mata_direita.png"), size, (255, 0, 0)
-        )
-        self.img_kill_left = load_image(
-            os.path.join("assets", "percival_mata_esquerda.png"), size, (255, 0, 0)
-        )
-
-        sword_size = (60, 60)
-        folder = os.path.join("assets", "espada")
-
-        self.sword_frames = {
-            "RIGHT": load_animation_from_folder_list(
-                folder, ["espada_pra_direita_1", "espada_pra_direita_2"], sword_size
-            ),
-            "LEFT": load_animation_from_folder_list(
-                folder, ["espada_pra_esquerda_1", "espada_pra_esquerda_2"], sword_size
-            ),
-            "UP": load_animation_from_folder_list(
-                folder, ["espada_pra_cima_1", "espada_pra_cima_2"], sword_size
-            ),
-            "DOWN": load_animation_from_folder_list(
-                folder, ["espada_pra_baixo_1", "espada_pra_baixo_2"], sword_size
-            ),
-        }
-
         self.image = self.frames_idle_right[0]
-        self.rect = self.image.get_rect(center=pos)
+        self.rect.center = self.pos
+        self.prev_center = None
         self.anim_timer = 0.0
         self.frame_index = 0
 
-    def control(self, keys, dt):
+    def control(self, inp, dt):
+        held = inp.held
         dir_vec = Vec(0, 0)
-        if keys[pg.K_LEFT] or keys[pg.K_a]:
+        if held & LEFT:
             dir_vec.x = -1
             self.facing = "LEFT"
-        if keys[pg.K_RIGHT] or keys[pg.K_d]:
+        if held & RIGHT:
             dir_vec.x = 1
             self.facing = "RIGHT"
-        if keys[pg.K_UP] or keys[pg.K_w]:
+        if held & UP:
             dir_vec.y = -1
             self.facing = "UP"
-        if keys[pg.K_DOWN] or keys[pg.K_s]:
+        if held & DOWN:
             dir_vec.y = 1
             self.facing = "DOWN"
 
@@ -155,12 +191,14 @@ class Player(pg.sprite.Sprite):
 
         self.vel = dir_vec * C.PLAYER_SPEED
 
-    def attack(self):
+    def attack(self, pool=None):
         if self.is_attacking or self.cool > 0:
             return None
         self.is_attacking = True
         self.cool = 0.4
         frames = self.sword_frames.get(self.facing, self.sword_frames["RIGHT"])
+        if pool is not None:
+            return pool.acquire(self, self.facing, frames)
         return Sword(self, self.facing, frames)
 
     def trigger_kill_anim(self):
@@ -208,17 +246,39 @@ class Player(pg.sprite.Sprite):
 
 
 class Enemy(pg.sprite.Sprite):
-    def __init__(self, pos, sound):
+    store = None
+    slot = None
+
+    def __init__(self, pos, sound, rng=None):
         super().__init__()
+        self.pool = None
+        self.in_pool = False
         self.pos = Vec(pos)
+        self.dir = Vec(0, 0)
+        self._rect = pg.Rect((0, 0), ENEMY_SIZE)
+        self.reset(pos, sound, rng)
+
+    @property
+    def rect(self):
+        # andando num EnemyStore a posição mora nos arrays: o rect só é
+        # alinhado quando alguém lê (colisão), não a cada passo
+        if self.store is not None and self.state == "WALK":
+            self._rect.center = self.store.pos[self.slot].tolist()
+        return self._rect
+
+    def reset(self, pos, sound, rng=None):
+        # chamado também pela SpritePool: reaproveita pos, dir e rect
+        self.pos.update(pos)
         self.sound = sound
+        self.prev_center = None
 
         self.state = "WALK"
         self.hp = 1
         self.facing = "RIGHT"
         size = ENEMY_SIZE
 
-        is_vampire = uniform(0, 1) < 0.5
+        rand = rng.uniform if rng is not None else uniform
+        is_vampire = rand(0, 1) < 0.5
         if is_vampire:
             base_folder = VAMPIRE_FOLDER
             base_names = VAMPIRE_NAMES
@@ -226,7 +286,7 @@ class Enemy(pg.sprite.Sprite):
             base_folder = SKELETON_FOLDER
             base_names = SKELETON_NAMES
 
-        frames = load_animation_from_folder_list(
+        frames = load_animation_bank(
             base_folder,
             base_names,
             size,
@@ -237,7 +297,7 @@ class Enemy(pg.sprite.Sprite):
         self.frames_attack = frames
         self.frames_death = frames
 
-        self.delay_walk = 0.18
+        self.delay_walk = ENEMY_WALK_DELAY
         self.delay_attack = 0.12
         self.delay_death = 0.10
 
@@ -246,22 +306,63 @@ class Enemy(pg.sprite.Sprite):
         self.current_frames = self.frames_walk
         self.current_delay = self.delay_walk
 
-        self.image = self.frames_walk[0]
-        self.rect = self.image.get_rect(center=pos)
+        self.image = self.frames_walk[self.facing][0]
+        self.rect.size = self.image.get_size()
+        self.rect.center = self.pos
 
         self.speed = C.UFO_SPEED
-        self.dir = Vec(0, 0)
+        self.dir.update(0, 0)
         self.attack_cool = 0.0
 
+        self.hash = None
+        self.hash_key = None
+        self.store = None
+        self.slot = None
+
+    def join_store(self, store):
+        self.store = store
+        self.slot = store.add(self)
+
+    def leave_store(self):
+        if self.store is not None:
+            self.store.remove(self.slot)
+            self.store = None
+            self.slot = None
+
+    def set_state(self, state):
+        if self.store is not None and self.state == "WALK":
+            self.store.pull(self)
+        self.state = state
+        if self.store is not None:
+            self.store.set_state(self.slot, state)
+
+    def join_hash(self, spatial_hash):
+        self.hash = spatial_hash
+        self.hash_key = spatial_hash.key_for(self.pos)
+        spatial_hash.insert(self, self.hash_key)
+
+    def leave_hash(self):
+        if self.hash is not None:
+            self.hash.remove(self, self.hash_key)
+            self.hash = None
+
+    def move_hash_cell(self, key):
+        if self.hash is not None and key != self.hash_key:
+            self.hash.move(self, self.hash_key, key)
+            self.hash_key = key
+
     def update(self, dt: float):
         if self.attack_cool > 0: self.attack_cool -= dt
         if self.state == "WALK": self.update_walk(dt)
         elif self.state == "ATTACK": self.update_attack(dt)
         elif self.state == "DEATH": self.update_death(dt)
         
-        if self.alive():
+        # no modo EnemyStore a posição é integrada pelos arrays
+        if self.alive() and self.store is None:
             self.pos = wrap_pos(self.pos)
             self.rect.center = self.pos
+            if self.hash is not None:
+                self.move_hash_cell(self.hash.key_for(self.pos))
 
     def update_walk(self, dt):
         self.pos += self.dir * self.speed * dt
@@ -275,6 +376,15 @@ class Enemy(pg.sprite.Sprite):
             self.state = "WALK"
             self.attack_cool = C.ENEMY_ATTACK_COOLDOWN
             self.update_image(self.frames_walk)
+            if self.store is not None:
+                self.store.push(self)
+
+    def kill(self):
+        self.leave_hash()
+        self.leave_store()
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
 
     def update_death(self, dt):
         finished = self.animate_once(dt, self.frames_death, self.delay_death)
@@ -284,7 +394,7 @@ class Enemy(pg.sprite.Sprite):
         self.anim_timer += dt
         if self.anim_timer >= delay:
             self.anim_timer = 0
-            self.frame_index = (self.frame_index + 1) % len(frames)
+            self.frame_index = (self.frame_index + 1) % len(frames["RIGHT"])
             self.update_image(frames)
 
     def animate_once(self, dt, frames, delay):
@@ -292,24 +402,28 @@ class Enemy(pg.sprite.Sprite):
         if self.anim_timer >= delay:
             self.anim_timer = 0
             self.frame_index += 1
-            if self.frame_index >= len(frames):
+            if self.frame_index >= len(frames["RIGHT"]):
                 self.frame_index = 0
                 return True
             else:
                 self.update_image(frames)
         return False
 
-    def update_image(self, frame_list):
-        idx = self.frame_index % len(frame_list)
-        base_img = frame_list[idx]
-        if self.facing == "LEFT":
-            base_img = pg.transform.flip(base_img, True, False)
-        self.image = base_img
-        self.rect = self.image.get_rect(center=self.pos)
+    def show_walk_frame(self, frame_index, is_left):
+        self.frame_index = frame_index
+        self.facing = "LEFT" if is_left else "RIGHT"
+        self.image = self.frames_walk[self.facing][frame_index]
+
+    def update_image(self, frame_bank):
+        frame_list = frame_bank[self.facing]
+        self.image = frame_list[self.frame_index % len(frame_list)]
+        self.rect.center = self.pos
 
     def trigger_attack(self):
+        if self.store is not None and self.state == "WALK":
+            self.store.pull(self)
         if self.state == "WALK" and self.attack_cool <= 0:
-            self.state = "ATTACK"
+            self.set_state("ATTACK")
             self.frame_index = 0
             self.anim_timer = 0
             self.update_image(self.frames_attack)
@@ -318,16 +432,8 @@ class Enemy(pg.sprite.Sprite):
         if self.state == "DEATH": return
         self.hp -= amount
         if self.hp <= 0:
-            self.state = "DEATH"
+            self.leave_hash()
+            self.set_state("DEATH")
             self.frame_index = 0
             self.anim_timer = 0
             self.update_image(self.frames_death)
-
-
-class Wall(pg.sprite.Sprite):
-    def __init__(self, x, y, width, height):
-        super().__init__()
-        self.image = pg.Surface((width, height))
-        self.image.fill((255, 0, 0))
-        self.image.set_alpha(128)
-        self.rect = self.image.get_rect(topleft=(x, y))
\ No newline at end of file
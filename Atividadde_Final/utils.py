@@ -1,5 +1,7 @@
+import json
 import math
 import os
+from collections import OrderedDict
 from random import random, uniform
 from typing import Iterable, Tuple
 from PIL import Image
@@ -8,11 +10,29 @@ import config as C
 
 Vec = pg.math.Vector2
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ATLAS_IMAGE = os.path.join(BASE_DIR, "assets", "atlas.png")
+ATLAS_INDEX = os.path.join(BASE_DIR, "assets", "atlas.json")
+
 
 def wrap_pos(pos: Vec) -> Vec:
     return Vec(pos.x % C.WIDTH, pos.y % C.HEIGHT)
 
 
+def interp_rect(spr, alpha):
+    # rect do sprite recuado para entre o passo anterior e o atual
+    rect = spr.rect
+    prev = getattr(spr, "prev_center", None)
+    if prev is None or alpha >= 1.0:
+        return rect
+    dx = rect.centerx - prev[0]
+    dy = rect.centery - prev[1]
+    if abs(dx) > C.WIDTH / 2 or abs(dy) > C.HEIGHT / 2:
+        return rect
+    back = 1.0 - alpha
+    return rect.move(-round(dx * back), -round(dy * back))
+
+
 def angle_to_vec(deg: float) -> Vec:
     rad = math.radians(deg)
     return Vec(math.cos(rad), math.sin(rad))
@@ -33,15 +53,98 @@ def rand_edge_pos() -> Vec:
     return Vec(x, y)
 
 
-def load_image(path, size, color):
+def display_format(surf, alpha=True):
+    # formato da tela: o blit não converte pixel a pixel todo frame.
+    # Sem display aberto (ferramentas, setup_assets) fica como está.
+    if pg.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+def accelerate(surf):
+    # sprites estáticos com transparência: RLE pula as áreas vazias no blit
+    if not C.SPRITE_RLE:
+        return surf
+    colorkey = surf.get_colorkey()
+    if colorkey is not None:
+        surf.set_colorkey(colorkey, pg.RLEACCEL)
+    elif surf.get_flags() & pg.SRCALPHA:
+        surf.set_alpha(255, pg.RLEACCEL)
+    return surf
+
+
+def read_image(path):
+    # só decodifica o arquivo; pode rodar fora da thread principal
     try:
-        img = pg.image.load(path).convert_alpha()
-        img = pg.transform.scale(img, size)
-        return img
+        return pg.image.load(path)
     except (FileNotFoundError, pg.error):
+        return None
+
+
+def prepare_image(img, size, color):
+    if img is None:
         surf = pg.Surface(size)
         surf.fill(color)
-        return surf
+        return display_format(surf, alpha=False)
+    return accelerate(pg.transform.scale(img.convert_alpha(), size))
+
+
+def load_image(path, size, color):
+    frame = atlas_frame(path, size)
+    if frame is not None:
+        return frame
+    return prepare_image(read_image(path), size, color)
+
+
+def atlas_key(path):
+    rel = os.path.relpath(os.path.abspath(path), BASE_DIR)
+    return rel.replace(os.sep, "/")
+
+
+_ATLAS = {"surface": None, "rects": None, "reported": False}
+
+
+def has_atlas():
+    return os.path.exists(ATLAS_IMAGE) and os.path.exists(ATLAS_INDEX)
+
+
+def report_missing_atlas():
+    # o atlas é gerado (setup_assets.py) e não vem no repositório; avisa uma vez
+    if _ATLAS["reported"]:
+        return
+    _ATLAS["reported"] = True
+    print(f"[ERRO] Atlas não encontrado ({ATLAS_IMAGE}); usando os arquivos soltos. "
+          "Rode 'python setup_assets.py' para gerar.")
+
+
+def read_atlas():
+    with open(ATLAS_INDEX, encoding="utf-8") as f:
+        rects = json.load(f)["frames"]
+    return pg.image.load(ATLAS_IMAGE), rects
+
+
+def install_atlas(data):
+    raw, rects = data
+    _ATLAS["surface"] = raw.convert_alpha()
+    _ATLAS["rects"] = rects
+
+
+def atlas_frame(path, size):
+    if _ATLAS["rects"] is None:
+        if not has_atlas():
+            report_missing_atlas()
+            _ATLAS["rects"] = {}
+        else:
+            try:
+                install_atlas(read_atlas())
+            except (OSError, ValueError, KeyError, pg.error) as e:
+                print(f"[ERRO] Não carregou o atlas: {e}")
+                _ATLAS["rects"] = {}
+
+    rect = _ATLAS["rects"].get(atlas_key(path))
+    if rect is None or tuple(rect[2:]) != tuple(size):
+        return None
+    return accelerate(_ATLAS["surface"].subsurface(rect))
 
 
 def load_gif_frames(path, size, color_fallback=(255, 0, 0)):
@@ -59,7 +162,7 @@ def load_gif_frames(path, size, color_fallback=(255, 0, 0)):
             data = frame.tobytes()
             py_img = pg.image.frombytes(data, s, mode)
             py_img = pg.transform.scale(py_img, size)
-            frames.append(py_img)
+            frames.append(accelerate(display_format(py_img)))
             
             pil_img.seek(pil_img.tell() + 1)
             
@@ -69,7 +172,7 @@ def load_gif_frames(path, size, color_fallback=(255, 0, 0)):
             surf1.fill(color_fallback)
             surf2 = pg.Surface(size)
             surf2.fill((255, 255, 255)) 
-            frames = [surf1, surf2]
+            frames = [display_format(surf1, alpha=False), display_format(surf2, alpha=False)]
             
     return frames, duration
 
@@ -88,50 +191,183 @@ def text(surface: pg.Surface, font: pg.font.Font, s: str, x: int, y: int):
     surface.blit(surf, rect)
 
 
-class AnimatedBackground:
-    def __init__(self, gif_path, screen_size):
-        self.frames = []
-        self.current_frame = 0
-        self.timer = 0.0
-        
+def decode_gif_frame(pil_img, screen_size):
+    frame = pil_img.convert("RGBA")
+    py_img = pg.image.frombytes(frame.tobytes(), frame.size, frame.mode)
+    return pg.transform.scale(py_img, screen_size)
+
+
+class GifFrames:
+    def __init__(self, frames, delay):
+        self.frames = frames
+        self.delay = delay
+
+    def __len__(self):
+        return len(self.frames)
+
+    def get(self, index):
+        return self.frames[index]
+
+    def to_display(self, loader=None):
+        # fundos são opacos: convert() sem alfa, na thread principal
+        self.frames = [display_format(f, alpha=False) for f in self.frames]
+
+
+class LazyGifFrames:
+    # Guarda só os ring_size frames a partir do que está na tela. Um worker
+    # do AssetPreloader decodifica o próximo frame que falta (seek para a
+    # frente, barato no GIF) e o poll() converte e põe no anel; quem ficou
+    # para trás sai. get() não decodifica: se o worker atrasou, repete o
+    # último frame. Sem preloader (ferramentas, bench) decodifica na hora.
+    def __init__(self, pil_img, screen_size, ring_size):
+        self.pil_img = pil_img
+        self.screen_size = screen_size
+        self.ring_size = max(1, ring_size)
+        self.count = getattr(pil_img, "n_frames", 1)
+        self.delay = pil_img.info.get('duration', 100) / 1000.0
+        self.ring = {}
+        self.loader = None
+        self.queued = None
+        self.playhead = 0
+        self.shown = None
+        self.decoded = 0
+        self.late = 0
+
+    def __len__(self):
+        return self.count
+
+    def get(self, index):
+        if index != self.playhead:
+            self.playhead = index
+            self._evict()
+        frame = self.ring.get(index)
+        if frame is None:
+            if self.loader is None:
+                self.pil_img.seek(index)
+                frame = display_format(decode_gif_frame(self.pil_img, self.screen_size), alpha=False)
+                self.decoded += 1
+                self.ring[index] = frame
+            elif self.shown is not None:
+                self.late += 1
+                frame = self.shown
+            else:
+                frame = pg.Surface(self.screen_size)
+        self.shown = frame
+        self._prefetch()
+        return frame
+
+    def to_display(self, loader=None):
+        # os frames são convertidos um a um quando chegam do worker
+        self.loader = loader
+        self._prefetch()
+
+    def _window(self):
+        return [(self.playhead + k) % self.count for k in range(min(self.ring_size, self.count))]
+
+    def _evict(self):
+        window = self._window()
+        for index in list(self.ring):
+            if index not in window:
+                del self.ring[index]
+
+    def _prefetch(self):
+        # um frame por vez: o Image do PIL não pode ser usado por duas threads
+        if self.loader is None or self.queued is not None:
+            return
+        for index in self._window():
+            if index not in self.ring:
+                self.queued = index
+                self.loader.add(self._decode, self._store, index)
+                return
+
+    def _decode(self, index):
         try:
-            pil_img = Image.open(gif_path)
-        except:
-            print(f"Erro ao carregar GIF: {gif_path}")
+            self.pil_img.seek(index)
+            return index, decode_gif_frame(self.pil_img, self.screen_size)
+        except (OSError, EOFError, ValueError) as e:
+            print(f"[ERRO] Não decodificou o frame {index} do fundo: {e}")
+            return index, None
+
+    def _store(self, result):
+        index, frame = result
+        if frame is None:
+            # queued fica preso: o fundo para no último frame bom
             return
+        self.queued = None
+        self.decoded += 1
+        if index in self._window():
+            self.ring[index] = display_format(frame, alpha=False)
+        self._prefetch()
 
+
+_BACKGROUNDS = {}
+
+
+def background_key(gif_path, screen_size, lazy=None):
+    if lazy is None:
+        lazy = C.BACKGROUND_LAZY
+    return (str(gif_path), tuple(screen_size), lazy)
+
+
+def cache_background(key, source):
+    _BACKGROUNDS[key] = source
+
+
+def load_background(gif_path, screen_size, lazy=None):
+    key = background_key(gif_path, screen_size, lazy)
+    source = _BACKGROUNDS.get(key)
+    if source is None:
+        source = decode_background(gif_path, screen_size, key[2])
+        source.to_display()
+        cache_background(key, source)
+    return source
+
+
+def decode_background(gif_path, screen_size, lazy):
+    try:
+        pil_img = Image.open(gif_path)
+    except Exception:
+        print(f"Erro ao carregar GIF: {gif_path}")
+        return GifFrames([], 0.1)
+
+    if lazy:
+        source = LazyGifFrames(pil_img, screen_size, C.BACKGROUND_RING_SIZE)
+    else:
+        delay = pil_img.info.get('duration', 100) / 1000.0
+        frames = []
         try:
             while True:
-                frame = pil_img.convert("RGBA")
-                mode = frame.mode
-                size = frame.size
-                data = frame.tobytes()
-                py_img = pg.image.frombytes(data, size, mode)
-                
-                py_img = pg.transform.scale(py_img, screen_size)
-                self.frames.append(py_img)
-                
+                frames.append(decode_gif_frame(pil_img, screen_size))
                 pil_img.seek(pil_img.tell() + 1)
         except EOFError:
-            pass 
+            pass
+        source = GifFrames(frames, delay)
+    return source
 
-        try:
-            self.delay = pil_img.info.get('duration', 100) / 1000.0
-        except:
-            self.delay = 0.1
+
+class AnimatedBackground:
+    def __init__(self, gif_path, screen_size, lazy=None):
+        self.source = load_background(gif_path, screen_size, lazy)
+        self.current_frame = 0
+        self.timer = 0.0
+        self.delay = self.source.delay
+
+    def rewind(self):
+        self.current_frame = 0
+        self.timer = 0.0
 
     def update(self, dt):
-        if not self.frames:
+        if not len(self.source):
             return
             
         self.timer += dt
         if self.timer >= self.delay:
             self.timer = 0
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
+            self.current_frame = (self.current_frame + 1) % len(self.source)
 
     def draw(self, surface):
-        if self.frames:
-            surface.blit(self.frames[self.current_frame], (0, 0))
+        if len(self.source):
+            surface.blit(self.source.get(self.current_frame), (0, 0))
         else:
             surface.fill((0, 0, 0))
 
@@ -152,17 +388,113 @@ def load_animation_from_folder(folder_path, size, count, color=(0, 255, 0)):
 
 def load_animation_from_folder_list(folder_path, filenames, size, color=(0, 255, 0)):
     frames = []
-    for name in filenames:
-        path = os.path.join(folder_path, name)
+    for full_path in frame_paths(folder_path, filenames):
         try:
-            full_path = path + ".png"
-            if not os.path.exists(full_path):
-                full_path = path + ".jpg"
-                
             img = load_image(full_path, size, color)
             frames.append(img)
         except:
             surf = pg.Surface(size)
             surf.fill(color)
             frames.append(surf)
-    return frames
\ No newline at end of file
+    return frames
+
+
+def surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+class FrameCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, loader):
+        frames = self.entries.get(key)
+        if frames is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return frames
+
+        self.misses += 1
+        frames = loader()
+        self.put(key, frames)
+        return frames
+
+    def put(self, key, frames):
+        if key in self.entries:
+            self.bytes -= self._size(self.entries.pop(key))
+        self.entries[key] = frames
+        self.bytes += self._size(frames)
+
+        # descarta os menos usados, mas nunca o que acabou de entrar
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= self._size(old)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+        }
+
+    def _size(self, frames):
+        return sum(surface_bytes(f) for f in frames)
+
+
+FRAME_CACHE = FrameCache(C.FRAME_CACHE_MAX_BYTES)
+
+
+def frames_key(folder_path, filenames, size):
+    return (folder_path, tuple(filenames), tuple(size))
+
+
+def frame_paths(folder_path, filenames):
+    paths = []
+    for name in filenames:
+        path = os.path.join(folder_path, name) + ".png"
+        if not os.path.exists(path):
+            path = os.path.join(folder_path, name) + ".jpg"
+        paths.append(path)
+    return paths
+
+
+def load_animation_cached(folder_path, filenames, size, color=(0, 255, 0)):
+    key = frames_key(folder_path, filenames, size)
+    return FRAME_CACHE.get(
+        key,
+        lambda: load_animation_from_folder_list(folder_path, filenames, size, color),
+    )
+
+
+
+def mirror_frames(frames):
+    return [accelerate(pg.transform.flip(img, True, False)) for img in frames]
+
+
+def load_animation_bank(folder_path, filenames, size, color=(0, 255, 0)):
+    right = load_animation_cached(folder_path, filenames, size, color)
+    key = frames_key(folder_path, filenames, size) + ("LEFT",)
+    left = FRAME_CACHE.get(key, lambda: mirror_frames(right))
+    return {"RIGHT": right, "LEFT": left}
+
+
+
+def image_key(path, size):
+    return (path, (), tuple(size))
+
+
+def load_image_cached(path, size, color):
+    key = image_key(path, size)
+    return FRAME_CACHE.get(key, lambda: [load_image(path, size, color)])[0]
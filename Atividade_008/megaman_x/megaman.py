@@ -66,6 +66,7 @@ def load_animation_folder(path: str, placeholder_color=(0, 255, 255)) -> List[py
 class Animation:
     def __init__(self, frames: List[pygame.Surface], speed: float, loop: bool = True):
         self.frames = frames
+        self.frames_left = [pygame.transform.flip(f, True, False) for f in frames]
         self.speed = speed
         self.loop = loop
         self.index = 0
@@ -91,6 +92,10 @@ class Animation:
     def frame(self) -> pygame.Surface:
         return self.frames[self.index]
 
+    def frame_facing(self, facing_right: bool) -> pygame.Surface:
+        bank = self.frames if facing_right else self.frames_left
+        return bank[self.index]
+
 class Player(pygame.sprite.Sprite):
     def __init__(self, x: int, y: int):
         super().__init__()
@@ -160,10 +165,7 @@ class Player(pygame.sprite.Sprite):
         self.update_state()
         self.animations[self.state].update(dt)
 
-        frame = self.animations[self.state].frame
-        if not self.facing_right:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame
+        self.image = self.animations[self.state].frame_facing(self.facing_right)
 
 def draw_floor(surface: pygame.Surface, y=420):
     pygame.draw.rect(surface, (20, 20, 20), (0, y, surface.get_width(), surface.get_height() - y))
@@ -0,0 +1,302 @@
+# Micro-benchmarks do Asteroids. Rode a partir desta pasta:
+#   python bench.py collisions
+#   python bench.py collisions --counts 1000 5000 --frames 100
+#   python bench.py storm --bodies 10000
+#   python bench.py dirty --counts 10 100 1000
+#   python bench.py shots --ufo-every 2.0
+import argparse
+import os
+import random
+import sys
+import time
+
+import pygame as pg
+
+import config as C
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def init_headless():
+    # sem janela nem placa de som; precisa vir antes do pg.init()
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.chdir(BASE_DIR)
+    pg.init()
+    return pg.display.set_mode((C.WIDTH, C.HEIGHT))
+
+
+def legacy_collisions(world):
+    # caminho antigo: groupcollide com lambda e laços aninhados, sem wrap;
+    # os tiros do BulletStore entram como Vec, como eram nos sprites
+    from bullets import SHIP, UFO
+
+    shots = world.shots
+    bullets = [pg.Vector2(shots.position(slot)) for slot in shots.live[SHIP]]
+    ufo_bullets = [pg.Vector2(shots.position(slot)) for slot in shots.live[UFO]]
+    for ast in world.asteroids:
+        for b in bullets or ufo_bullets:
+            if (ast.pos - b).length() < ast.r:
+                pass
+    ship = world.ship
+    for ast in world.asteroids:
+        if (ast.pos - ship.pos).length() < (ast.r + ship.r):
+            break
+    for ufo in world.ufos:
+        if (ufo.pos - ship.pos).length() < (ufo.r + ship.r):
+            break
+    for b in ufo_bullets:
+        if (b - ship.pos).length() < (shots.r + ship.r):
+            break
+    for ufo in list(world.ufos):
+        for b in bullets:
+            if (ufo.pos - b).length() < (ufo.r + shots.r):
+                pass
+    for ufo in list(world.ufos):
+        for ast in list(world.asteroids):
+            if (ufo.pos - ast.pos).length() < (ufo.r + ast.r):
+                break
+
+
+def torus_dist2(a, b):
+    dx = abs(a.x - b.x) % C.WIDTH
+    dy = abs(a.y - b.y) % C.HEIGHT
+    dx = min(dx, C.WIDTH - dx)
+    dy = min(dy, C.HEIGHT - dy)
+    return dx * dx + dy * dy
+
+
+def collision_field(world):
+    # nave, tiros e UFOs fixos; os asteroides ficam longe de todos eles,
+    # então nenhum caminho muda o estado e os dois medem o mesmo trabalho.
+    # Devolve (posição, raio) de cada um.
+    from bullets import SHIP, UFO as UFO_SHOTS
+    from kinematics import KIND_UFO
+    from sprites import UFO
+
+    world.reset()
+    world.safe = 0
+    world.ship.invuln = 0
+    still = pg.Vector2(0, 0)
+    for i in range(C.MAX_BULLETS):
+        world.shots.fire(SHIP, (120 + i * 220, 600), still)
+    for i in range(3):
+        world.shots.fire(UFO_SHOTS, (200 + i * 250, 120), still)
+    for i, small in enumerate((False, True)):
+        ufo = UFO(pg.Vector2(300 + i * 360, 360), small)
+        world.track(ufo, KIND_UFO)
+        world.ufos.add(ufo)
+    protected = [(world.ship.pos, world.ship.r)]
+    protected += [(pg.Vector2(world.shots.position(slot)), world.shots.r)
+                  for part in world.shots.live for slot in part]
+    protected += [(ufo.pos, ufo.r) for ufo in world.ufos]
+    return protected
+
+
+def field_state(world):
+    shots = world.shots
+    return (world.score, world.lives, len(world.asteroids), len(world.ufos),
+            [len(part) for part in shots.live])
+
+
+def fill_asteroids(world, protected, count, rng):
+    for ast in list(world.asteroids):
+        ast.kill()
+    while len(world.asteroids) < count:
+        pos = pg.Vector2(rng.uniform(0, C.WIDTH), rng.uniform(0, C.HEIGHT))
+        size = rng.choice("LMS")
+        r = C.AST_SIZES[size]["r"]
+        if any(torus_dist2(pos, p) <= (r + pr + 1) ** 2 for p, pr in protected):
+            continue
+        world.spawn_asteroid(pos, pg.Vector2(0, 0), size)
+
+
+def bench_collisions(args):
+    init_headless()
+    from systems import World
+
+    rng = random.Random(args.seed)
+    world = World()
+    protected = collision_field(world)
+
+    print(f"{'asteroides':>10} {'antigo ms':>10} {'hash ms':>10} {'ganho':>7}")
+    for count in args.counts:
+        fill_asteroids(world, protected, count, rng)
+        before = field_state(world)
+
+        timings = []
+        for func in (legacy_collisions, World.handle_collisions):
+            t0 = time.perf_counter()
+            for _ in range(args.frames):
+                func(world)
+            timings.append((time.perf_counter() - t0) / args.frames * 1000.0)
+
+        after = field_state(world)
+        if after != before:
+            print(f"[ERRO] Campo mudou durante a medição: {before} -> {after}")
+            return 1
+        print(f"{count:>10} {timings[0]:>10.3f} {timings[1]:>10.3f} "
+              f"{timings[0] / timings[1]:>6.1f}x")
+    return 0
+
+
+def storm_world(count, soa, seed):
+    from systems import World
+
+    C.BODIES_SOA = soa
+    rng = random.Random(seed)
+    world = World()
+    # nave intocável e sem UFOs: só asteroides andando e batendo em nada
+    world.safe = 1e9
+    world.ufo_timer = 1e9
+    for _ in range(count):
+        pos = pg.Vector2(rng.uniform(0, C.WIDTH), rng.uniform(0, C.HEIGHT))
+        vel = pg.Vector2(rng.uniform(-C.AST_VEL_MAX, C.AST_VEL_MAX),
+                         rng.uniform(-C.AST_VEL_MAX, C.AST_VEL_MAX))
+        world.spawn_asteroid(pos, vel, rng.choice("LMS"))
+    return world
+
+
+def bench_storm(args):
+    screen = init_headless()
+    font = pg.font.Font(None, 20)
+    keys = pg.key.get_pressed()
+    sim_dt = 1.0 / C.SIM_HZ
+    steps = max(1, round(C.SIM_HZ / C.FPS))
+    C.AST_SPIN_MAX = args.spin
+
+    print(f"{args.bodies} asteroides, {steps} passos de {sim_dt * 1000:.2f} ms por frame")
+    print(f"{'modo':<11} {'update ms':>10} {'draw ms':>9} {'frame ms':>9} {'fps':>7}")
+    for soa in (False, True):
+        world = storm_world(args.bodies, soa, args.seed)
+        update_s = draw_s = 0.0
+        for _ in range(args.frames):
+            t0 = time.perf_counter()
+            for _ in range(steps):
+                world.update(sim_dt, keys)
+            t1 = time.perf_counter()
+            if not args.no_draw:
+                screen.fill(C.BLACK)
+                world.draw(screen, font, 0.5)
+            t2 = time.perf_counter()
+            update_s += t1 - t0
+            draw_s += t2 - t1
+        update_ms = update_s / args.frames * 1000.0
+        draw_ms = draw_s / args.frames * 1000.0
+        frame_ms = update_ms + draw_ms
+        name = "arrays" if soa else "por sprite"
+        print(f"{name:<11} {update_ms:>10.2f} {draw_ms:>9.2f} {frame_ms:>9.2f} "
+              f"{1000.0 / frame_ms:>7.1f}")
+    # a meta do pedido é a tempestade a FPS cheio no modo arrays
+    budget = 1000.0 / C.FPS
+    verdict = "atingida" if frame_ms <= budget else f"NÃO atingida (faltam {frame_ms - budget:.1f} ms)"
+    print(f"meta {C.FPS} FPS ({budget:.1f} ms/frame) no modo arrays: {verdict}")
+
+    from shapes import library
+
+    shapes = library().stats()
+    print(f"formas: {shapes['outlines']} contornos, {shapes['cached']} imagens no cache, "
+          f"{shapes['misses']} rasterizadas")
+    return 0
+
+
+def bench_dirty(args):
+    from render import DirtyRenderer
+
+    screen = init_headless()
+    font = pg.font.Font(None, 20)
+    keys = pg.key.get_pressed()
+    sim_dt = 1.0 / C.SIM_HZ
+    steps = max(1, round(C.SIM_HZ / C.FPS))
+
+    print(f"{'asteroides':>10} {'poupado':>8} {'px/frame':>9} {'flip cheio':>11} {'draw ms':>8}")
+    for count in args.counts:
+        world = storm_world(count, True, args.seed)
+        renderer = DirtyRenderer(screen)
+        draw_s = 0.0
+        for _ in range(args.frames):
+            for _ in range(steps):
+                world.update(sim_dt, keys)
+            t0 = time.perf_counter()
+            renderer.draw(world, font, 0.5)
+            draw_s += time.perf_counter() - t0
+        st = renderer.stats()
+        print(f"{count:>10} {st['saved_fraction']:>8.0%} {st['saved_px_per_frame']:>9.0f} "
+              f"{st['full_frames']:>5d}/{st['frames']:<5d} "
+              f"{draw_s / args.frames * 1000.0:>8.2f}")
+    return 0
+
+
+def bench_shots(args):
+    screen = init_headless()
+    from systems import World
+
+    C.UFO_SPAWN_EVERY = args.ufo_every
+    random.seed(args.seed)
+    world = World()
+    font = pg.font.Font(None, 20)
+    keys = pg.key.get_pressed()
+    sim_dt = 1.0 / C.SIM_HZ
+    steps = int(args.seconds * C.SIM_HZ)
+    fire_every = max(1, round(C.SHIP_FIRE_RATE * C.SIM_HZ))
+
+    shots = world.shots
+    shots_s = 0.0
+    for i in range(steps):
+        # nave sempre intocável: a partida não reinicia no meio da medição
+        world.safe = 1.0
+        if i % fire_every == 0:
+            world.try_fire()
+        world.update(sim_dt, keys)
+        t0 = time.perf_counter()
+        shots.update(0.0)
+        shots.draw(screen, 1.0)
+        shots_s += time.perf_counter() - t0
+
+    st = shots.stats()
+    print(f"{args.seconds:.0f} s simulados, UFO a cada {args.ufo_every:.1f} s, "
+          f"{len(world.ufos)} UFOs vivos no fim")
+    print(f"  {st['fired']} tiros disparados")
+    for part in ("ship", "ufo"):
+        print(f"  {part:<5} pico {st['high_water'][part]:>3} de {st['capacity'][part]:>3} slots")
+    print(f"  {st['overwritten']} tiros de UFO reciclados com a partição cheia")
+    print(f"  update+draw dos tiros: {shots_s / steps * 1e6:.1f} us por passo")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("collisions", help="laços antigos vs hash espacial em toro")
+    p.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 2000, 5000])
+    p.add_argument("--frames", type=int, default=50)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_collisions)
+
+    p = sub.add_parser("storm", help="tempestade de asteroides: sprites vs arrays")
+    p.add_argument("--bodies", type=int, default=10000)
+    p.add_argument("--frames", type=int, default=60)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--spin", type=float, default=C.AST_SPIN_MAX, help="giro máximo em deg/s")
+    p.add_argument("--no-draw", action="store_true")
+    p.set_defaults(func=bench_storm)
+
+    p = sub.add_parser("dirty", help="área poupada pelo renderer de retângulos sujos")
+    p.add_argument("--counts", type=int, nargs="+", default=[5, 20, 100, 1000])
+    p.add_argument("--frames", type=int, default=120)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_dirty)
+
+    p = sub.add_parser("shots", help="tiros no BulletStore com UFOs frequentes")
+    p.add_argument("--ufo-every", type=float, default=2.0)
+    p.add_argument("--seconds", type=float, default=60.0)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_shots)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
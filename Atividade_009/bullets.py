@@ -0,0 +1,120 @@
+import config as C
+from utils import draw_circle
+
+SHIP = 0
+UFO = 1
+
+
+class BulletStore:
+    # Todos os tiros em listas pré-alocadas de capacidade fixa, sem sprite,
+    # Vec, Rect nem grupos. A nave e os UFOs têm partições separadas, cada
+    # uma com sua lista de slots livres. Partição cheia vira anel: o tiro
+    # novo ocupa o slot do tiro mais antigo dela (a nave nunca chega lá,
+    # try_fire para em MAX_BULLETS).
+    def __init__(self, ship_cap=C.MAX_BULLETS, ufo_cap=C.UFO_BULLET_CAP):
+        size = ship_cap + ufo_cap
+        self.x = [0.0] * size
+        self.y = [0.0] * size
+        self.vx = [0.0] * size
+        self.vy = [0.0] * size
+        self.prev_x = [0.0] * size
+        self.prev_y = [0.0] * size
+        self.ttl = [0.0] * size
+        self.active = [False] * size
+        self.r = C.BULLET_RADIUS
+        self.parts = (range(0, ship_cap), range(ship_cap, size))
+        self.free = [list(reversed(part)) for part in self.parts]
+        self.live = [[] for _ in self.parts]
+        self.fired = 0
+        self.overwritten = 0
+        self.high_water = [0 for _ in self.parts]
+
+    def count(self, part: int) -> int:
+        return len(self.live[part])
+
+    def alive(self, slot: int) -> bool:
+        return self.active[slot]
+
+    def fire(self, part: int, pos, vel):
+        free = self.free[part]
+        if free:
+            slot = free.pop()
+        elif self.live[part]:
+            # anel: live está em ordem de disparo, o primeiro é o mais antigo
+            slot = self.live[part].pop(0)
+            self.overwritten += 1
+        else:
+            return None
+        self.x[slot] = self.prev_x[slot] = pos[0]
+        self.y[slot] = self.prev_y[slot] = pos[1]
+        self.vx[slot] = vel[0]
+        self.vy[slot] = vel[1]
+        self.ttl[slot] = C.BULLET_TTL
+        self.active[slot] = True
+        live = self.live[part]
+        live.append(slot)
+        if len(live) > self.high_water[part]:
+            self.high_water[part] = len(live)
+        self.fired += 1
+        return slot
+
+    def release(self, slot: int):
+        if not self.active[slot]:
+            return
+        self.active[slot] = False
+        part = SHIP if slot in self.parts[SHIP] else UFO
+        self.live[part].remove(slot)
+        self.free[part].append(slot)
+
+    def clear(self):
+        for part in (SHIP, UFO):
+            for slot in list(self.live[part]):
+                self.release(slot)
+
+    def snapshot(self):
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def update(self, dt: float):
+        x, y, vx, vy, ttl = self.x, self.y, self.vx, self.vy, self.ttl
+        w, h = C.WIDTH, C.HEIGHT
+        for part in (SHIP, UFO):
+            for slot in list(self.live[part]):
+                x[slot] = (x[slot] + vx[slot] * dt) % w
+                y[slot] = (y[slot] + vy[slot] * dt) % h
+                ttl[slot] -= dt
+                if ttl[slot] <= 0:
+                    self.release(slot)
+
+    def points(self, part: int):
+        # listas paralelas (x, y, r, slot) para o TorusHash
+        live = self.live[part]
+        return ([self.x[i] for i in live], [self.y[i] for i in live],
+                [self.r] * len(live), list(live))
+
+    def position(self, slot: int):
+        return self.x[slot], self.y[slot]
+
+    def draw(self, surf, alpha: float = 1.0, rects=None):
+        x, y, px, py = self.x, self.y, self.prev_x, self.prev_y
+        half_w, half_h = C.WIDTH / 2, C.HEIGHT / 2
+        for part in (SHIP, UFO):
+            for slot in self.live[part]:
+                dx = x[slot] - px[slot]
+                dy = y[slot] - py[slot]
+                # quem deu a volta na tela não é interpolado
+                if alpha >= 1.0 or abs(dx) > half_w or abs(dy) > half_h:
+                    pos = (x[slot], y[slot])
+                else:
+                    pos = (px[slot] + dx * alpha, py[slot] + dy * alpha)
+                rect = draw_circle(surf, pos, self.r)
+                if rects is not None:
+                    rects.append(rect)
+
+    def stats(self):
+        return {
+            "fired": self.fired,
+            "overwritten": self.overwritten,
+            "high_water": {"ship": self.high_water[SHIP], "ufo": self.high_water[UFO]},
+            "capacity": {"ship": len(self.parts[SHIP]), "ufo": len(self.parts[UFO])},
+        }
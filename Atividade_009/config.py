@@ -2,6 +2,10 @@
 WIDTH = 960
 HEIGHT = 720
 FPS = 60
+SIM_HZ = 120        # passos de simulação por segundo (fixo)
+MAX_SIM_STEPS = 5   # limite de passos de recuperação por frame
+DIRTY_RECTS = True        # redesenha e envia só as regiões que mudaram
+DIRTY_MAX_FRACTION = 0.5  # acima dessa fração da tela suja, volta ao flip cheio
 
 # Jogo
 START_LIVES = 3
@@ -25,11 +29,15 @@ AST_SIZES = {
     "M": {"r": 24, "score": 50, "split": ["S", "S"]},
     "S": {"r": 12, "score": 100, "split": []},
 }
+AST_SHAPES_PER_SIZE = 8  # contornos pré-gerados por tamanho, reaproveitados
+AST_ROT_STEPS = 32       # ângulos guardados no cache de rotação
+AST_SPIN_MAX = 0.0       # deg/s de giro máximo (0 = sem giro)
 
 # Tiro
 BULLET_RADIUS = 2
 BULLET_TTL = 1.0
 MAX_BULLETS = 4
+UFO_BULLET_CAP = 32  # tiros de UFO vivos ao mesmo tempo (cheio: recicla o mais antigo)
 
 # UFO
 UFO_SPAWN_EVERY = 15.0
@@ -50,3 +58,7 @@ BLACK = (0, 0, 0)
 
 # Aleatoriedade
 RANDOM_SEED = None  # ou defina um int para reprodutibilidade
+
+# Colisões
+COLLISION_CELL = 64  # px, lado da célula do hash espacial (toro)
+BODIES_SOA = True    # asteroides e UFOs integrados em arrays NumPy
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 import pygame as pg
 
 import config as C
+from render import DirtyRenderer
 from systems import World
 from utils import text
 
@@ -26,17 +27,18 @@ class Game:
         self.big = pg.font.SysFont("consolas", 48)
         self.scene = Scene("menu")
         self.world = World()
+        self.renderer = DirtyRenderer(self.screen) if C.DIRTY_RECTS else None
+        self.sim_dt = 1.0 / C.SIM_HZ
+        self.accumulator = 0.0
 
     def run(self):
         while True:
             dt = self.clock.tick(C.FPS) / 1000.0
             for e in pg.event.get():
                 if e.type == pg.QUIT:
-                    pg.quit()
-                    sys.exit(0)
+                    self.quit()
                 if e.type == pg.KEYDOWN and e.key == pg.K_ESCAPE:
-                    pg.quit()
-                    sys.exit(0)
+                    self.quit()
                 if self.scene.name == "play":
                     if e.type == pg.KEYDOWN and e.key == pg.K_SPACE:
                         self.world.try_fire()
@@ -47,15 +49,44 @@ class Game:
                         self.scene = Scene("play")
 
             keys = pg.key.get_pressed()
+            if self.scene.name == "play" and self.renderer is not None:
+                alpha = self.step_world(dt, keys)
+                self.renderer.draw(self.world, self.font, alpha)
+                continue
+
             self.screen.fill(C.BLACK)
 
             if self.scene.name == "menu":
                 self.draw_menu()
             elif self.scene.name == "play":
-                self.world.update(dt, keys)
-                self.world.draw(self.screen, self.font)
+                alpha = self.step_world(dt, keys)
+                self.world.draw(self.screen, self.font, alpha)
 
             pg.display.flip()
+            if self.renderer is not None:
+                self.renderer.invalidate()
+
+    def quit(self):
+        if self.renderer is not None and self.renderer.frames:
+            st = self.renderer.stats()
+            print(f"[PERF] Dirty rects: {st['saved_fraction']:.0%} da tela poupada por frame "
+                  f"({st['saved_px_per_frame']:.0f} px), "
+                  f"{st['full_frames']} de {st['frames']} frames com flip cheio")
+        pg.quit()
+        sys.exit(0)
+
+    def step_world(self, dt: float, keys) -> float:
+        # Simulação em passo fixo; o que sobra no acumulador vira interpolação
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= self.sim_dt and steps < C.MAX_SIM_STEPS:
+            self.world.update(self.sim_dt, keys)
+            self.accumulator -= self.sim_dt
+            steps += 1
+        if steps == C.MAX_SIM_STEPS:
+            # Muito atrasado: descarta o excesso em vez de acelerar o jogo
+            self.accumulator = min(self.accumulator, self.sim_dt)
+        return self.accumulator / self.sim_dt
 
     def draw_menu(self):
         text(self.screen, self.big, "ASTEROIDS",
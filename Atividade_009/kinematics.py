@@ -0,0 +1,152 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import config as C
+from utils import Vec
+
+KIND_ASTEROID = 0
+KIND_UFO = 1
+
+
+def bodies_available():
+    return np is not None and C.BODIES_SOA
+
+
+class BodyStore:
+    # Posição, velocidade, raio e giro de todo corpo que anda em linha reta
+    # (asteroides e UFOs) em arrays contíguos. Integração e wrap rodam em
+    # poucas chamadas vetorizadas; o sprite só guarda o slot e lê/escreve
+    # nos arrays. Ninguém aqui expira: os tiros, que tinham TTL, ficam no
+    # BulletStore.
+    def __init__(self, capacity=256):
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.delta = np.zeros((capacity, 2))
+        self.r = np.zeros(capacity)
+        self.angle = np.zeros(capacity)
+        self.spin = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.sprites = np.full(capacity, None, dtype=object)
+        # imagem pronta de quem é desenhado por blit (asteroides)
+        self.image = np.full(capacity, None, dtype=object)
+        self.half = np.zeros(capacity)
+        self.img_step = np.full(capacity, -1, dtype=np.int32)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.bounds = np.array([C.WIDTH, C.HEIGHT], dtype=float)
+        self.spinning = False
+
+    def __len__(self):
+        return len(self.sprites) - len(self.free)
+
+    def add(self, sprite, kind):
+        if not self.free:
+            self._grow()
+        slot = self.free.pop()
+        self.pos[slot] = sprite._pos
+        self.prev_pos[slot] = sprite._pos
+        self.vel[slot] = sprite._vel
+        self.r[slot] = sprite.r
+        self.angle[slot] = sprite._angle
+        self.spin[slot] = sprite._spin
+        if sprite._spin:
+            self.spinning = True
+        self.kind[slot] = kind
+        self.active[slot] = True
+        self.sprites[slot] = sprite
+        self.image[slot] = getattr(sprite, "image", None)
+        self.half[slot] = getattr(sprite, "half", 0)
+        self.img_step[slot] = getattr(sprite, "step", -1)
+        sprite.store = self
+        sprite.slot = slot
+        return slot
+
+    def remove(self, sprite):
+        # devolve o estado ao sprite, que volta a ser um objeto comum
+        slot = sprite.slot
+        sprite._pos = Vec(self.pos[slot].tolist())
+        sprite._vel = Vec(self.vel[slot].tolist())
+        sprite._angle = float(self.angle[slot])
+        sprite.store = None
+        sprite.slot = -1
+        self.vel[slot] = 0.0
+        self.spin[slot] = 0.0
+        self.active[slot] = False
+        self.sprites[slot] = None
+        self.image[slot] = None
+        self.free.append(slot)
+
+    def clear(self):
+        for sprite in self.sprites[self.active].tolist():
+            self.remove(sprite)
+
+    def snapshot(self):
+        np.copyto(self.prev_pos, self.pos)
+
+    def update(self, dt):
+        # slots livres têm vel 0: integrar tudo é mais barato do que filtrar
+        np.multiply(self.vel, dt, out=self.delta)
+        self.pos += self.delta
+        np.mod(self.pos, self.bounds, out=self.pos)
+        if self.spinning:
+            self.angle += self.spin * dt
+            np.mod(self.angle, 360.0, out=self.angle)
+
+    def indices(self, kind):
+        return np.flatnonzero(self.active & (self.kind == kind))
+
+    def coords(self, slots):
+        # listas (xs, ys) dos slots pedidos, para laços Python sem Vec
+        rows = self.pos[slots]
+        return rows[:, 0].tolist(), rows[:, 1].tolist()
+
+    def build_hash(self, spatial, kind):
+        idx = self.indices(kind)
+        spatial.build_arrays(self.pos[idx], self.r[idx], self.sprites[idx])
+
+    def draw_positions(self, alpha):
+        # posição de cada slot para o draw, interpolada entre os dois passos
+        if alpha >= 1.0:
+            return self.pos
+        delta = self.pos - self.prev_pos
+        # quem deu a volta na tela não é interpolado
+        wrapped = np.any(np.abs(delta) > self.bounds / 2, axis=1)
+        delta[wrapped] = 0.0
+        return np.where(wrapped[:, None], self.pos, self.prev_pos + delta * alpha)
+
+    def set_image(self, slot, image, half, step):
+        self.image[slot] = image
+        self.half[slot] = half
+        self.img_step[slot] = step
+
+    def blit_items(self, pos, idx):
+        # pares (imagem, topo-esquerdo) prontos para Surface.blits; o blit
+        # trunca a posição para int de qualquer jeito, e ints passam mais
+        # rápido pelo blits que floats
+        topleft = (pos[idx] - self.half[idx, None]).astype(np.int64)
+        return list(zip(self.image[idx].tolist(), topleft.tolist()))
+
+    def _grow(self):
+        old = len(self.sprites)
+        self.pos = _extend(self.pos, old, 0.0)
+        self.prev_pos = _extend(self.prev_pos, old, 0.0)
+        self.vel = _extend(self.vel, old, 0.0)
+        self.delta = _extend(self.delta, old, 0.0)
+        self.r = _extend(self.r, old, 0.0)
+        self.angle = _extend(self.angle, old, 0.0)
+        self.spin = _extend(self.spin, old, 0.0)
+        self.kind = _extend(self.kind, old, 0)
+        self.active = _extend(self.active, old, False)
+        self.sprites = _extend(self.sprites, old, None)
+        self.image = _extend(self.image, old, None)
+        self.half = _extend(self.half, old, 0.0)
+        self.img_step = _extend(self.img_step, old, -1)
+        self.free.extend(range(2 * old - 1, old - 1, -1))
+
+
+def _extend(arr, extra, fill):
+    tail = np.full((extra,) + arr.shape[1:], fill, dtype=arr.dtype)
+    return np.concatenate([arr, tail])
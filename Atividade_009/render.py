@@ -0,0 +1,68 @@
+import pygame as pg
+
+import config as C
+
+
+class DirtyRenderer:
+    # Fundo preto e quase vazio: em vez de fill + flip na tela toda, apaga os
+    # retângulos do frame anterior, redesenha e manda para a tela só os
+    # retângulos velhos e novos. Se a área suja passa de DIRTY_MAX_FRACTION,
+    # o frame sai com fill + flip como antes.
+    def __init__(self, screen: pg.Surface, max_fraction: float = C.DIRTY_MAX_FRACTION):
+        self.screen = screen
+        self.bounds = screen.get_rect()
+        self.screen_area = self.bounds.width * self.bounds.height
+        self.max_area = self.screen_area * max_fraction
+        self.prev = None        # None: o próximo frame apaga a tela toda
+        self.prev_area = 0
+        self.frames = 0
+        self.full_frames = 0
+        self.saved_px = 0
+
+    def invalidate(self):
+        # algo fora do renderer desenhou na tela (menu, troca de cena)
+        self.prev = None
+
+    def draw(self, world, font: pg.font.Font, alpha: float):
+        screen = self.screen
+        if self.prev is None or self.prev_area > self.max_area:
+            screen.fill(C.BLACK)
+        else:
+            for rect in self.prev:
+                screen.fill(C.BLACK, rect)
+
+        rects = []
+        world.draw(screen, font, alpha, rects)
+
+        area = self._area(rects)
+        self.frames += 1
+        if self.prev is None or self.prev_area + area > self.max_area:
+            pg.display.flip()
+            self.full_frames += 1
+        else:
+            pushed = self.prev + rects
+            pg.display.update(pushed)
+            self.saved_px += self.screen_area - self._area(pushed)
+        self.prev = rects
+        self.prev_area = area
+
+    def _area(self, rects):
+        # soma das áreas já cortadas pela tela; sobreposição conta duas vezes,
+        # então a economia relatada é um piso
+        bounds = self.bounds
+        total = 0
+        for rect in rects:
+            clipped = bounds.clip(rect)
+            total += clipped.width * clipped.height
+            if total > self.max_area:
+                return total
+        return total
+
+    def stats(self):
+        frames = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "saved_px_per_frame": self.saved_px / frames,
+            "saved_fraction": self.saved_px / (frames * self.screen_area),
+        }
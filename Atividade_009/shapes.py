@@ -0,0 +1,95 @@
+import math
+from random import randrange, uniform
+
+import pygame as pg
+
+import config as C
+
+SIDES = {"L": 12, "M": 10, "S": 8}
+JITTER = (0.75, 1.2)
+
+_RINGS = {}
+
+
+def unit_ring(steps: int):
+    # direções dos vértices, calculadas uma vez por quantidade de lados
+    ring = _RINGS.get(steps)
+    if ring is None:
+        ring = [(math.cos(i * math.tau / steps), math.sin(i * math.tau / steps))
+                for i in range(steps)]
+        _RINGS[steps] = ring
+    return ring
+
+
+class AsteroidShapes:
+    # Biblioteca de contornos de asteroide: uma quantidade fixa por tamanho
+    # (L/M/S), gerada uma vez e reaproveitada por todo asteroide e pedaço
+    # novo. Cada contorno vira uma Surface com colorkey; com giro, cada ângulo
+    # quantizado é rasterizado de novo a partir dos vértices na primeira vez
+    # que aparece e fica no cache.
+    def __init__(self, per_size=C.AST_SHAPES_PER_SIZE, rot_steps=C.AST_ROT_STEPS):
+        self.rot_steps = rot_steps
+        self.outlines = {}
+        for size, info in C.AST_SIZES.items():
+            r = info["r"]
+            ring = unit_ring(SIDES[size])
+            self.outlines[size] = [
+                [(dx * r * uniform(*JITTER), dy * r * uniform(*JITTER)) for dx, dy in ring]
+                for _ in range(per_size)
+            ]
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def pick(self, size: str) -> int:
+        return randrange(len(self.outlines[size]))
+
+    def step_of(self, angle: float) -> int:
+        return int(angle % 360.0 / 360.0 * self.rot_steps) % self.rot_steps
+
+    def steps_of(self, angles):
+        # step_of para um array de ângulos
+        return (angles % 360.0 / 360.0 * self.rot_steps).astype(int) % self.rot_steps
+
+    def image(self, size: str, shape: int, step: int = 0):
+        key = (size, shape, step)
+        img = self.cache.get(key)
+        if img is None:
+            img = self._render(self.outlines[size][shape], step)
+            self.cache[key] = img
+            self.misses += 1
+        else:
+            self.hits += 1
+        return img
+
+    def _render(self, outline, step):
+        rad = step * math.tau / self.rot_steps
+        cos_a, sin_a = math.cos(rad), math.sin(rad)
+        pts = [(x * cos_a - y * sin_a, x * sin_a + y * cos_a) for x, y in outline]
+        # meio lado inteiro: o centro do asteroide cai num pixel exato
+        half = math.ceil(max(max(abs(x), abs(y)) for x, y in pts)) + 1
+        surf = pg.Surface((half * 2 + 1, half * 2 + 1))
+        pg.draw.polygon(surf, C.WHITE, [(x + half, y + half) for x, y in pts], width=1)
+        if pg.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.set_colorkey(C.BLACK, pg.RLEACCEL)
+        return surf
+
+    def stats(self):
+        return {
+            "outlines": sum(len(v) for v in self.outlines.values()),
+            "cached": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_LIBRARY = None
+
+
+def library() -> AsteroidShapes:
+    # criada na primeira vez que um asteroide nasce, depois do set_mode
+    global _LIBRARY
+    if _LIBRARY is None:
+        _LIBRARY = AsteroidShapes()
+    return _LIBRARY
@@ -1,11 +1,103 @@
 import pygame as pg
 import config as C
 
+# Canais reservados para cada categoria
+CHANNELS = {"nave": 2, "ufo": 2, "explosao": 4}
+
+# som: (categoria, vozes ao mesmo tempo, janela para juntar em ms, prioridade)
+VOICES = {
+    "player_shoot": ("nave", 2, 30, 1),
+    "ufo_shoot": ("ufo", 2, 80, 0),
+    "explosion": ("explosao", 3, 50, 2),
+}
+
+
+class VoiceManager:
+    # Controla as vozes: disparos iguais colados no tempo viram um só, cada
+    # som tem limite de vozes e, com a categoria lotada, o som mais
+    # importante toma o canal do menos importante.
+    def __init__(self, channels, voices, sounds):
+        total = sum(channels.values())
+        if pg.mixer.get_num_channels() < total:
+            pg.mixer.set_num_channels(total)
+        pg.mixer.set_reserved(total)
+
+        # cada canal guarda [Channel, nome do som, prioridade]
+        self.slots = {}
+        index = 0
+        for category, count in channels.items():
+            self.slots[category] = []
+            for _ in range(count):
+                self.slots[category].append([pg.mixer.Channel(index), None, -1])
+                index += 1
+
+        self.voices = voices
+        self.sounds = sounds
+        self.last_play = {}
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.stolen = 0
+
+    def play(self, name):
+        snd = self.sounds.get(name)
+        if snd is None:
+            return False
+        category, max_voices, window_ms, priority = self.voices[name]
+
+        now = pg.time.get_ticks()
+        if name in self.last_play and now - self.last_play[name] < window_ms:
+            self.coalesced += 1
+            return False
+
+        free = None
+        weakest = None
+        active = 0
+        for slot in self.slots[category]:
+            if not slot[0].get_busy():
+                free = free or slot
+                continue
+            if slot[1] == name:
+                active += 1
+            if weakest is None or slot[2] < weakest[2]:
+                weakest = slot
+
+        if active >= max_voices:
+            self.dropped += 1
+            return False
+        if free is None:
+            if weakest is None or weakest[2] >= priority:
+                self.dropped += 1
+                return False
+            weakest[0].stop()
+            self.stolen += 1
+            free = weakest
+
+        free[0].play(snd)
+        free[1] = name
+        free[2] = priority
+        self.last_play[name] = now
+        self.played += 1
+        return True
+
+    def stats(self):
+        return {
+            "played": self.played,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "stolen": self.stolen,
+        }
+
 
 class SoundManager:
     def __init__(self):
         pg.mixer.init()
         self.load_sounds()
+        self.voices = VoiceManager(CHANNELS, VOICES, {
+            "player_shoot": self.player_shoot,
+            "ufo_shoot": self.ufo_shoot,
+            "explosion": self.explosion,
+        })
 
     def load_sounds(self):
         try:
@@ -29,13 +121,13 @@ class SoundManager:
                 snd.set_volume(C.MASTER_VOLUME)
 
     def play_player_shoot(self):
-        if self.player_shoot:
-            self.player_shoot.play()
+        self.voices.play("player_shoot")
 
     def play_ufo_shoot(self):
-        if self.ufo_shoot:
-            self.ufo_shoot.play()
+        self.voices.play("ufo_shoot")
 
     def play_explosion(self):
-        if self.explosion:
-            self.explosion.play()
+        self.voices.play("explosion")
+
+    def stats(self):
+        return self.voices.stats()
@@ -0,0 +1,116 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import config as C
+
+
+class TorusHash:
+    # Grade uniforme sobre a tela em forma de toro: a célula à direita da
+    # última coluna é a primeira, igual ao wrap_pos. Cada objeto entra só na
+    # célula do seu centro. Os objetos ficam ordenados por célula em listas
+    # paralelas e cada célula guarda só a faixa [início, fim) dela; a consulta
+    # varre as células que o raio alcança, somado ao maior raio guardado.
+    def __init__(self, cell_size: int, width: int = C.WIDTH, height: int = C.HEIGHT):
+        self.width = width
+        self.height = height
+        self.cols = max(1, round(width / cell_size))
+        self.rows = max(1, round(height / cell_size))
+        self.cell_w = width / self.cols
+        self.cell_h = height / self.rows
+        self._set([], [], [], [], [], 0)
+
+    def __len__(self):
+        return len(self.objs)
+
+    def cell_of(self, x: float, y: float):
+        return (int(x / self.cell_w) % self.cols, int(y / self.cell_h) % self.rows)
+
+    def build(self, objs):
+        xs, ys, rs = [], [], []
+        for obj in objs:
+            pos = obj.pos
+            xs.append(pos.x)
+            ys.append(pos.y)
+            rs.append(obj.r)
+        self.build_lists(xs, ys, rs, list(objs))
+
+    def build_lists(self, xs, ys, rs, objs):
+        # listas paralelas; objs pode ser qualquer coisa (sprite, slot...)
+        cw, ch, cols, rows = self.cell_w, self.cell_h, self.cols, self.rows
+        keys = [(int(y / ch) % rows) * cols + int(x / cw) % cols for x, y in zip(xs, ys)]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._set([keys[i] for i in order], [xs[i] for i in order], [ys[i] for i in order],
+                  [rs[i] for i in order], [objs[i] for i in order], max(rs, default=0))
+
+    def build_arrays(self, pos, radii, objs):
+        # mesma grade a partir dos arrays do BodyStore: índice da célula e
+        # ordenação vetorizados, sem laço Python por objeto
+        if len(objs) == 0:
+            self._set([], [], [], [], [], 0)
+            return
+        cx = (pos[:, 0] / self.cell_w).astype(np.int64) % self.cols
+        cy = (pos[:, 1] / self.cell_h).astype(np.int64) % self.rows
+        keys = cy * self.cols + cx
+        if self.cols * self.rows <= np.iinfo(np.int16).max:
+            # chaves pequenas: o sort estável do NumPy vira radix sort
+            keys = keys.astype(np.int16)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        cuts = (np.flatnonzero(np.diff(keys)) + 1).tolist()
+        self._set_ranges(
+            keys[[0] + cuts].tolist(), cuts,
+            pos[order, 0].tolist(), pos[order, 1].tolist(),
+            radii[order].tolist(), objs[order].tolist(), float(radii.max()),
+        )
+
+    def _set(self, keys, xs, ys, rs, objs, max_r):
+        # keys já ordenadas: acha onde cada célula começa
+        cuts = [i for i in range(1, len(keys)) if keys[i] != keys[i - 1]]
+        firsts = [keys[i] for i in [0] + cuts] if keys else []
+        self._set_ranges(firsts, cuts, xs, ys, rs, objs, max_r)
+
+    def _set_ranges(self, keys, cuts, xs, ys, rs, objs, max_r):
+        starts = [0] + cuts
+        ends = cuts + [len(objs)]
+        self.ranges = dict(zip(keys, zip(starts, ends)))
+        self.xs, self.ys, self.rs, self.objs = xs, ys, rs, objs
+        self.max_r = max_r
+
+    def query(self, x: float, y: float, r: float):
+        # objetos cujo círculo encosta no círculo (x, y, r), já com o wrap
+        ranges = self.ranges
+        if not ranges:
+            return []
+        reach = r + self.max_r
+        w, h = self.width, self.height
+        half_w, half_h = w / 2, h / 2
+        x0 = int((x - reach) // self.cell_w)
+        x1 = int((x + reach) // self.cell_w)
+        y0 = int((y - reach) // self.cell_h)
+        y1 = int((y + reach) // self.cell_h)
+        # raio maior que a tela: não repete colunas/linhas
+        xs_range = range(x0, x1 + 1) if x1 - x0 < self.cols else range(self.cols)
+        ys_range = range(y0, y1 + 1) if y1 - y0 < self.rows else range(self.rows)
+
+        found = []
+        xs, ys, rs, objs = self.xs, self.ys, self.rs, self.objs
+        cols, rows = self.cols, self.rows
+        for cy in ys_range:
+            row = (cy % rows) * cols
+            for cx in xs_range:
+                span = ranges.get(row + cx % cols)
+                if span is None:
+                    continue
+                for i in range(*span):
+                    dx = (xs[i] - x) % w
+                    if dx > half_w:
+                        dx -= w
+                    dy = (ys[i] - y) % h
+                    if dy > half_h:
+                        dy -= h
+                    rr = r + rs[i]
+                    if dx * dx + dy * dy < rr * rr:
+                        found.append(objs[i])
+        return found
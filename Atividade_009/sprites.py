@@ -1,63 +1,111 @@
-import math
 from random import uniform
 
 import pygame as pg
 
 import config as C
+from shapes import library
 from utils import Vec, angle_to_vec, draw_circle, draw_poly, wrap_pos
 
 
-class Bullet(pg.sprite.Sprite):
-    def __init__(self, pos: Vec, vel: Vec):
+class Body(pg.sprite.Sprite):
+    # Corpo que anda em linha reta e dá a volta na tela. Dentro de um
+    # BodyStore, pos/vel moram nos arrays e o update é feito em lote;
+    # fora dele, o próprio sprite integra. Com store, ler pos/vel/rect monta
+    # um Vec/Rect novo: é para código frio, os laços por passo leem os arrays.
+    store = None
+    slot = -1
+
+    def __init__(self, pos: Vec, vel: Vec, r: int, angle: float = 0.0, spin: float = 0.0):
         super().__init__()
-        self.pos = Vec(pos)
-        self.vel = Vec(vel)
-        self.ttl = C.BULLET_TTL
-        self.r = C.BULLET_RADIUS
-        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
+        self._pos = Vec(pos)
+        self._vel = Vec(vel)
+        self._angle = angle
+        self._spin = spin
+        self.r = r
+
+    @property
+    def pos(self) -> Vec:
+        if self.store is None:
+            return self._pos
+        return Vec(self.store.pos[self.slot].tolist())
+
+    @pos.setter
+    def pos(self, value):
+        if self.store is None:
+            self._pos = Vec(value)
+        else:
+            self.store.pos[self.slot] = value
+
+    @property
+    def vel(self) -> Vec:
+        if self.store is None:
+            return self._vel
+        return Vec(self.store.vel[self.slot].tolist())
+
+    @vel.setter
+    def vel(self, value):
+        if self.store is None:
+            self._vel = Vec(value)
+        else:
+            self.store.vel[self.slot] = value
+
+    @property
+    def angle(self) -> float:
+        if self.store is None:
+            return self._angle
+        return float(self.store.angle[self.slot])
+
+    @property
+    def rect(self) -> pg.Rect:
+        rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
+        rect.center = self.pos
+        return rect
 
-    def update(self, dt: float):
-        self.pos += self.vel * dt
-        self.pos = wrap_pos(self.pos)
-        self.ttl -= dt
-        if self.ttl <= 0:
-            self.kill()
-        self.rect.center = self.pos
+    def kill(self):
+        if self.store is not None:
+            self.store.remove(self)
+        super().kill()
 
-    def draw(self, surf: pg.Surface):
-        draw_circle(surf, self.pos, self.r)
+    def update(self, dt: float):
+        # wrap no próprio Vec, sem alocar um novo a cada passo
+        pos = self._pos
+        pos += self._vel * dt
+        pos.x %= C.WIDTH
+        pos.y %= C.HEIGHT
+        if self._spin:
+            self._angle = (self._angle + self._spin * dt) % 360.0
 
 
-class Asteroid(pg.sprite.Sprite):
+class Asteroid(Body):
+    # O contorno vem da biblioteca de formas, já rasterizado; o draw é um blit
     def __init__(self, pos: Vec, vel: Vec, size: str):
-        super().__init__()
-        self.pos = Vec(pos)
-        self.vel = Vec(vel)
+        if C.AST_SPIN_MAX > 0:
+            angle = uniform(0, 360)
+            spin = uniform(-C.AST_SPIN_MAX, C.AST_SPIN_MAX)
+        else:
+            angle = spin = 0.0
+        super().__init__(pos, vel, C.AST_SIZES[size]["r"], angle=angle, spin=spin)
         self.size = size  # 'L' | 'M' | 'S'
-        self.r = C.AST_SIZES[size]["r"]
-        self.poly = self._make_poly()
-        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
-
-    def _make_poly(self):
-        steps = 12 if self.size == "L" else 10 if self.size == "M" else 8
-        pts = []
-        for i in range(steps):
-            ang = i * (360 / steps)
-            jitter = uniform(0.75, 1.2)
-            r = self.r * jitter
-            v = Vec(math.cos(math.radians(ang)),
-                    math.sin(math.radians(ang)))
-            pts.append(v * r)
-        return pts
-
-    def update(self, dt: float):
-        self.pos += self.vel * dt
-        self.pos = wrap_pos(self.pos)
-        self.rect.center = self.pos
-
-    def draw(self, surf: pg.Surface):
-        pts = [(self.pos + p) for p in self.poly]
-        pg.draw.polygon(surf, C.WHITE, pts, width=1)
+        self.shape = library().pick(size)
+        self.step = -1
+        self.show_angle(angle)
+
+    def show_angle(self, angle: float):
+        # só troca de imagem quando o ângulo cai em outro passo do cache
+        shapes = library()
+        step = shapes.step_of(angle)
+        if step != self.step:
+            self.step = step
+            self.image = shapes.image(self.size, self.shape, step)
+            self.half = self.image.get_width() // 2
+            if self.store is not None:
+                self.store.set_image(self.slot, self.image, self.half, step)
+
+    def draw(self, surf: pg.Surface) -> pg.Rect:
+        if self._spin:
+            self.show_angle(self.angle)
+        x, y = self.pos
+        return surf.blit(self.image, (x - self.half, y - self.half))
 
 
 class Ship(pg.sprite.Sprite):
@@ -65,12 +113,20 @@ class Ship(pg.sprite.Sprite):
         super().__init__()
         self.pos = Vec(pos)
         self.vel = Vec(0, 0)
+        self.r = C.SHIP_RADIUS
+        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
+        self.reset(pos)
+
+    def reset(self, pos: Vec):
+        # Volta ao estado inicial sem recriar a nave
+        self.pos = Vec(pos)
+        self.vel.xy = (0, 0)
         self.angle = -90.0
         self.cool = 0.0
         self.invuln = 0.0
         self.alive = True
-        self.r = C.SHIP_RADIUS
-        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
+        self.prev_pos = None
+        self.rect.center = self.pos
 
     def control(self, keys: pg.key.ScancodeWrapper, dt: float):
         if keys[pg.K_LEFT]:
@@ -81,14 +137,15 @@ class Ship(pg.sprite.Sprite):
             self.vel += angle_to_vec(self.angle) * C.SHIP_THRUST * dt
         self.vel *= C.SHIP_FRICTION
 
-    def fire(self) -> Bullet | None:
+    def fire(self) -> tuple[Vec, Vec] | None:
+        # posição e velocidade do tiro; quem guarda é o BulletStore
         if self.cool > 0:
             return None
         dirv = angle_to_vec(self.angle)
         pos = self.pos + dirv * (self.r + 6)
         vel = self.vel + dirv * C.SHIP_BULLET_SPEED
         self.cool = C.SHIP_FIRE_RATE
-        return Bullet(pos, vel)
+        return pos, vel
 
     def hyperspace(self):
         self.pos = Vec(uniform(0, C.WIDTH), uniform(0, C.HEIGHT))
@@ -104,38 +161,37 @@ class Ship(pg.sprite.Sprite):
         self.pos = wrap_pos(self.pos)
         self.rect.center = self.pos
 
-    def draw(self, surf: pg.Surface):
+    def draw(self, surf: pg.Surface) -> pg.Rect:
         dirv = angle_to_vec(self.angle)
         left = angle_to_vec(self.angle + 140)
         right = angle_to_vec(self.angle - 140)
         p1 = self.pos + dirv * self.r
         p2 = self.pos + left * self.r * 0.9
         p3 = self.pos + right * self.r * 0.9
-        draw_poly(surf, [p1, p2, p3])
+        rect = draw_poly(surf, [p1, p2, p3])
         if self.invuln > 0 and int(self.invuln * 10) % 2 == 0:
-            draw_circle(surf, self.pos, self.r + 6)
+            rect = rect.union(draw_circle(surf, self.pos, self.r + 6))
+        return rect
 
 
-class UFO(pg.sprite.Sprite):
+class UFO(Body):
     def __init__(self, pos: Vec, small: bool):
-        super().__init__()
-        self.pos = Vec(pos)
+        r = C.UFO_SMALL["r"] if small else C.UFO_BIG["r"]
+        super().__init__(pos, Vec(0, 0), r)
         self.small = small
-        self.r = C.UFO_SMALL["r"] if small else C.UFO_BIG["r"]
         self.speed = C.UFO_SPEED
-        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
         self.dir = Vec(1, 0) if uniform(0, 1) < 0.5 else Vec(-1, 0)
 
     def update(self, dt: float):
-        self.pos += self.dir * self.speed * dt
-        self.pos = wrap_pos(self.pos)
-        self.rect.center = self.pos
+        self.vel = self.dir * self.speed
+        super().update(dt)
 
-    def draw(self, surf: pg.Surface):
+    def draw(self, surf: pg.Surface, pos=None) -> pg.Rect:
+        x, y = self.pos if pos is None else pos
         w, h = self.r * 2, self.r
         rect = pg.Rect(0, 0, w, h)
-        rect.center = self.pos
-        pg.draw.ellipse(surf, C.WHITE, rect, width=1)
+        rect.center = (x, y)
+        rect = pg.draw.ellipse(surf, C.WHITE, rect, width=1)
         cup = pg.Rect(0, 0, w * 0.5, h * 0.7)
-        cup.center = (self.pos.x, self.pos.y - h * 0.3)
-        pg.draw.ellipse(surf, C.WHITE, cup, width=1)
+        cup.center = (x, y - h * 0.3)
+        return rect.union(pg.draw.ellipse(surf, C.WHITE, cup, width=1))
@@ -4,27 +4,47 @@ from random import uniform
 import pygame as pg
 
 import config as C
-from sprites import Asteroid, Ship, UFO, Bullet  #
-from utils import Vec, rand_edge_pos, rand_unit_vec
+from bullets import SHIP, UFO as UFO_SHOTS, BulletStore
+from sprites import Asteroid, Ship, UFO  #
+from utils import Vec, interp_pos, rand_edge_pos, rand_unit_vec
+from kinematics import KIND_ASTEROID, KIND_UFO, BodyStore, bodies_available
+from shapes import library
 from sound import SoundManager  #
+from spatial import TorusHash
 
 
 class World:
 
     def __init__(self):
+        # Recursos que sobrevivem ao game over: sons, nave, grupos e tiros
+        self.sound = SoundManager()  # 
         self.ship = Ship(Vec(C.WIDTH / 2, C.HEIGHT / 2))
-        self.bullets = pg.sprite.Group()
-        self.ufo_bullets = pg.sprite.Group()  # 
+        self.shots = BulletStore()
         self.asteroids = pg.sprite.Group()
         self.ufos = pg.sprite.Group()
-        self.all_sprites = pg.sprite.Group(self.ship)
+        self.all_sprites = pg.sprite.Group()
+        self.ast_hash = TorusHash(C.COLLISION_CELL)
+        self.ufo_hash = TorusHash(C.COLLISION_CELL)
+        self.bullet_hash = TorusHash(C.COLLISION_CELL)
+        self.ufo_bullet_hash = TorusHash(C.COLLISION_CELL)
+        self.bodies = BodyStore() if bodies_available() else None
+        self.reset()
+
+    def reset(self):
+        # Reinicia só o estado da partida; nada de recarregar sons
+        for group in (self.asteroids, self.ufos, self.all_sprites):
+            group.empty()
+        self.shots.clear()
+        if self.bodies is not None:
+            self.bodies.clear()
+        self.ship.reset(Vec(C.WIDTH / 2, C.HEIGHT / 2))
+        self.all_sprites.add(self.ship)
         self.score = 0
         self.lives = C.START_LIVES
         self.wave = 0
         self.wave_cool = C.WAVE_DELAY
         self.safe = C.SAFE_SPAWN_TIME
         self.ufo_timer = C.UFO_SPAWN_EVERY
-        self.sound = SoundManager()  # 
 
     def start_wave(self):
         self.wave += 1
@@ -40,6 +60,7 @@ class World:
 
     def spawn_asteroid(self, pos: Vec, vel: Vec, size: str):
         a = Asteroid(pos, vel, size)
+        self.track(a, KIND_ASTEROID)
         self.asteroids.add(a)
         self.all_sprites.add(a)
 
@@ -58,16 +79,21 @@ class World:
             else: 
                 ufo.dir = Vec(-1, 0) 
         ufo.shoot_cool = 0.0  
+        self.track(ufo, KIND_UFO)
         self.ufos.add(ufo)
         self.all_sprites.add(ufo)
 
+    def track(self, spr, kind: int):
+        # corpos em linha reta passam a ser integrados pelos arrays
+        if self.bodies is not None:
+            self.bodies.add(spr, kind)
+
     def try_fire(self):
-        if len(self.bullets) >= C.MAX_BULLETS:
+        if self.shots.count(SHIP) >= C.MAX_BULLETS:
             return
-        b = self.ship.fire()
-        if b:
-            self.bullets.add(b)
-            self.all_sprites.add(b)
+        shot = self.ship.fire()
+        if shot:
+            self.shots.fire(SHIP, *shot)
             self.sound.play_player_shoot()  
 
     def hyperspace(self):
@@ -75,15 +101,31 @@ class World:
         self.score = max(0, self.score - C.HYPERSPACE_COST)
 
     def update(self, dt: float, keys):
+        # Guarda a posição do passo anterior para o draw interpolar
+        self.shots.snapshot()
+        if self.bodies is not None:
+            self.bodies.snapshot()
+            self.ship.prev_pos = Vec(self.ship.pos)
+        else:
+            for spr in self.all_sprites:
+                spr.prev_pos = Vec(spr.pos)
+
         #Atualização dos Inputs e Sprites
-        self.all_sprites.update(dt)
+        if self.bodies is not None:
+            self.ship.update(dt)
+            for ufo in self.ufos:
+                ufo.vel = ufo.dir * ufo.speed
+            self.bodies.update(dt)
+        else:
+            self.all_sprites.update(dt)
+        self.shots.update(dt)
         self.ship.control(keys, dt)
 
         #Perseguição dinâmica da nave pequena de recalculação
-        for ufo in self.ufos:
+        for ufo, x, y in self.ufo_points():
             if ufo.small:
                 #Vetor do ufo para o player
-                to_ship = (self.ship.pos - ufo.pos)
+                to_ship = (self.ship.pos - (x, y))
 
                 if to_ship.length() > 0:
                     target_dir = to_ship.normalize()
@@ -109,67 +151,95 @@ class World:
         elif not self.asteroids:
             self.wave_cool -= dt
 
+    def ufo_points(self):
+        # (ufo, x, y) de cada UFO; com os arrays, uma leitura só para todos
+        # em vez de um Vec novo por ufo.pos
+        ufos = list(self.ufos)
+        if self.bodies is None:
+            return [(ufo, ufo.pos.x, ufo.pos.y) for ufo in ufos]
+        xs, ys = self.bodies.coords([ufo.slot for ufo in ufos])
+        return list(zip(ufos, xs, ys))
+
     def update_ufo_shots(self, dt: float):  # 
-        for ufo in self.ufos:  
+        for ufo, x, y in self.ufo_points():
             ufo.shoot_cool = getattr(ufo, "shoot_cool", 0.0) - dt
             if ufo.shoot_cool <= 0:
-                if (self.ship.pos - ufo.pos).length() > 0:
-                    dirv = (self.ship.pos - ufo.pos).normalize()
+                to_ship = self.ship.pos - (x, y)
+                if to_ship.length() > 0:
+                    dirv = to_ship.normalize()
                 else:  
                     dirv = Vec(0,-1) #Caso esteja exatamente na posição do UFO
                 vel = dirv * C.SHIP_BULLET_SPEED
-                b = Bullet(ufo.pos, vel) 
-                self.ufo_bullets.add(b) 
-                self.all_sprites.add(b)
+                self.shots.fire(UFO_SHOTS, (x, y), vel)
                 self.sound.play_ufo_shoot() 
                 ufo.shoot_cool = 1.5 
 
     def handle_collisions(self):
-        hits = pg.sprite.groupcollide(
-            self.asteroids,
-            self.bullets or self.ufo_bullets,
-            False,
-            True,
-            collided=lambda a, b: (a.pos - b.pos).length() < a.r,
-        )
-        for ast, _ in hits.items():
+        # Um hash por tipo, refeito a cada passo; cada par consulta só as
+        # células vizinhas, com distância medida dando a volta na tela
+        if self.bodies is not None:
+            self.bodies.build_hash(self.ast_hash, KIND_ASTEROID)
+            self.bodies.build_hash(self.ufo_hash, KIND_UFO)
+        else:
+            self.ast_hash.build(self.asteroids)
+            self.ufo_hash.build(self.ufos)
+        ufos = self.ufo_points()
+        shots = self.shots
+        self.bullet_hash.build_lists(*shots.points(SHIP))
+        self.ufo_bullet_hash.build_lists(*shots.points(UFO_SHOTS))
+
+        # tiros quebram asteroides: basta o centro do tiro dentro do asteroide.
+        # Os da nave e os dos UFOs; o original só olhava os dos UFOs quando a
+        # nave não tinha tiro no ar (self.bullets or self.ufo_bullets)
+        hits = {}
+        for part in (SHIP, UFO_SHOTS):
+            for slot in list(shots.live[part]):
+                found = self.ast_hash.query(*shots.position(slot), 0)
+                if found:
+                    shots.release(slot)
+                    for ast in found:
+                        hits[ast] = True
+        for ast in hits:
             self.split_asteroid(ast)
 
-        if self.ship.invuln <= 0 and self.safe <= 0:
-            for ast in self.asteroids:
-                if (ast.pos - self.ship.pos).length() < (ast.r + self.ship.r):
-                    self.ship_die()
-                    break
-            for ufo in self.ufos:
-                if (ufo.pos - self.ship.pos).length() < (ufo.r + self.ship.r):
-                    self.ship_die()
-                    break
-            
-            for b in list(self.ufo_bullets): 
-                if (b.pos - self.ship.pos).length() < (b.r + self.ship.r):
-                    b.kill()
+        ship = self.ship
+        if ship.invuln <= 0 and self.safe <= 0:
+            x, y = ship.pos.x, ship.pos.y
+            if self.ast_hash.query(x, y, ship.r) or self.ufo_hash.query(x, y, ship.r):
+                self.ship_die()
+            else:
+                for slot in self.ufo_bullet_hash.query(x, y, ship.r):
+                    # tiro de UFO já gasto num asteroide neste passo não mata
+                    if not shots.alive(slot):
+                        continue
+                    shots.release(slot)
                     self.ship_die()
                     break
 
-        for ufo in list(self.ufos):
-            for b in list(self.bullets):
-                if (ufo.pos - b.pos).length() < (ufo.r + b.r):
-                    score = (C.UFO_SMALL["score"] if ufo.small
-                             else C.UFO_BIG["score"])
-                    self.score += score
-                    ufo.kill()
-                    b.kill()
-                    self.sound.play_explosion() 
+        for ufo, x, y in ufos:
+            for slot in self.bullet_hash.query(x, y, ufo.r):
+                if not shots.alive(slot):
+                    continue
+                score = (C.UFO_SMALL["score"] if ufo.small
+                         else C.UFO_BIG["score"])
+                self.score += score
+                ufo.kill()
+                shots.release(slot)
+                self.sound.play_explosion()
+                break
 
         #break for asteroids
-        for ufo in list(self.ufos): 
-            for ast in list(self.asteroids):
-                if (ufo.pos - ast.pos).length() < (ufo.r + ast.r): 
-                    score = (C.UFO_SMALL["score"] if ufo.small else C.UFO_BIG["score"]) 
-                    self.score += score
-                    self.split_asteroid(ast) 
-                    ufo.kill()  
-                    break
+        for ufo, x, y in ufos:
+            if not ufo.alive():
+                continue
+            for ast in self.ast_hash.query(x, y, ufo.r):
+                if not ast.alive():
+                    continue
+                score = (C.UFO_SMALL["score"] if ufo.small else C.UFO_BIG["score"])
+                self.score += score
+                self.split_asteroid(ast)
+                ufo.kill()
+                break
 
     def split_asteroid(self, ast: Asteroid):
         self.score += C.AST_SIZES[ast.size]["score"]
@@ -192,13 +262,52 @@ class World:
         self.safe = C.SAFE_SPAWN_TIME
         if self.lives < 0:
             # Reset total
-            self.__init__()
+            self.reset()
+
+    def draw_asteroids(self, surf: pg.Surface, pos, rects=None):
+        # todos os asteroides num único blits(), direto dos arrays
+        bodies = self.bodies
+        idx = bodies.indices(KIND_ASTEROID)
+        if bodies.spinning:
+            # com giro, só quem mudou de passo troca de imagem
+            steps = library().steps_of(bodies.angle[idx])
+            stale = idx[steps != bodies.img_step[idx]]
+            for i, angle in zip(stale.tolist(), bodies.angle[stale].tolist()):
+                bodies.sprites[i].show_angle(angle)
+        if rects is None:
+            surf.blits(bodies.blit_items(pos, idx), doreturn=False)
+        else:
+            rects.extend(surf.blits(bodies.blit_items(pos, idx)))
 
-    def draw(self, surf: pg.Surface, font: pg.font.Font):
-        for spr in self.all_sprites:
-            spr.draw(surf)
+    def draw(self, surf: pg.Surface, font: pg.font.Font, alpha: float = 1.0, rects=None):
+        # rects: se vier uma lista, recebe o retângulo de tudo que foi desenhado
+        if self.bodies is not None:
+            # asteroides já saem pelo blits(); o laço só vê a nave e os UFOs
+            body_pos = self.bodies.draw_positions(alpha)
+            self.draw_asteroids(surf, body_pos, rects)
+            sprites = [self.ship, *self.ufos]
+        else:
+            sprites = self.all_sprites
+        for spr in sprites:
+            if getattr(spr, "store", None) is not None:
+                rect = spr.draw(surf, body_pos[spr.slot].tolist())
+            else:
+                prev = getattr(spr, "prev_pos", None)
+                if alpha >= 1.0 or prev is None:
+                    rect = spr.draw(surf)
+                else:
+                    # Desenha na posição interpolada sem mexer no estado simulado
+                    cur = spr.pos
+                    spr.pos = interp_pos(prev, cur, alpha)
+                    rect = spr.draw(surf)
+                    spr.pos = cur
+            if rects is not None:
+                rects.append(rect)
+        self.shots.draw(surf, alpha, rects)
 
-        pg.draw.line(surf, (60, 60, 60), (0, 50), (C.WIDTH, 50), width=1)
+        line = pg.draw.line(surf, (60, 60, 60), (0, 50), (C.WIDTH, 50), width=1)
         txt = f"SCORE {self.score:06d}   LIVES {self.lives}   WAVE {self.wave}"
         label = font.render(txt, True, C.WHITE)
-        surf.blit(label, (10, 10))
+        hud = surf.blit(label, (10, 10))
+        if rects is not None:
+            rects += (line, hud)
@@ -13,6 +13,14 @@ def wrap_pos(pos: Vec) -> Vec:
     return Vec(pos.x % C.WIDTH, pos.y % C.HEIGHT)
 
 
+def interp_pos(prev: Vec, cur: Vec, alpha: float) -> Vec:
+    # Não interpola quem deu a volta na tela (wrap)
+    delta = cur - prev
+    if abs(delta.x) > C.WIDTH / 2 or abs(delta.y) > C.HEIGHT / 2:
+        return cur
+    return prev + delta * alpha
+
+
 def angle_to_vec(deg: float) -> Vec:
     rad = math.radians(deg)
     return Vec(math.cos(rad), math.sin(rad))
@@ -33,12 +41,12 @@ def rand_edge_pos() -> Vec:
     return Vec(x, y)
 
 
-def draw_poly(surface: pg.Surface, pts: Iterable[Tuple[int, int]]):
-    pg.draw.polygon(surface, C.WHITE, list(pts), width=1)
+def draw_poly(surface: pg.Surface, pts: Iterable[Tuple[int, int]]) -> pg.Rect:
+    return pg.draw.polygon(surface, C.WHITE, list(pts), width=1)
 
 
-def draw_circle(surface: pg.Surface, pos: Vec, r: int):
-    pg.draw.circle(surface, C.WHITE, pos, r, width=1)
+def draw_circle(surface: pg.Surface, pos: Vec, r: int) -> pg.Rect:
+    return pg.draw.circle(surface, C.WHITE, pos, r, width=1)
 
 
 def text(surface: pg.Surface, font: pg.font.Font, s: str, x: int, y: int):